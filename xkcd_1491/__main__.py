@@ -1,18 +1,72 @@
 import logging
+from argparse import ArgumentParser
+from contextlib import ExitStack
 from datetime import date
 from pathlib import Path
 
-from matplotlib.pyplot import rc_context, subplots
+from matplotlib import __version__ as matplotlib_version
+from matplotlib.pyplot import rc_context, rcParams, subplots
 from matplotlib.ticker import AsinhLocator, EngFormatter, FixedLocator, MultipleLocator
 
-from .adjust_text import adjust_text
+from .adjust_text import JsonLines, add_arrows, adjust_text, prepare_figure
 from .amend import amend
-from .data import load_data
+from .data import DataFilter, load_data
+from .layout_cache import (
+    LAYOUT_VERSION,
+    layout_key,
+    load_layout,
+    load_warm_start,
+    save_layout,
+)
+from .occupancy import OccupancyGrid
 from .util import draw, draw_areas, palette
 from .warp_scale import WarpScale
 from .xkcd import xkcd
 
-data = load_data(Path("data").iterdir())
+parser = ArgumentParser(prog="xkcd_1491")
+parser.add_argument(
+    "--relayout",
+    action="store_true",
+    help="adjust texts again even if a cached layout exists",
+)
+parser.add_argument(
+    "--jobs",
+    type=int,
+    help="adjust independent clusters of texts in this many processes",
+)
+parser.add_argument(
+    "--trace",
+    type=Path,
+    help="write telemetry of adjusting texts to this file as JSON lines",
+)
+parser.add_argument(
+    "--no-progress",
+    dest="progress",
+    action="store_false",
+    help="hide progress bars",
+)
+parser.add_argument(
+    "--cull",
+    type=float,
+    help="hide less important texts overlapping more than this many pixels",
+)
+parser.add_argument(
+    "--author",
+    help="only draw publications by this author",
+)
+parser.add_argument(
+    "--name",
+    help="only draw publications whose names match this regular expression",
+)
+args = parser.parse_args()
+
+y_lim = (-10e6, 31e6)  # Auto mode has too much margins
+# Skip what would fall outside the view
+data_filter = DataFilter(set_in_delta=y_lim, author=args.author, name=args.name)
+
+data = list(
+    load_data(Path("data").iterdir(), cache_dir=Path(".cache/data"), where=data_filter)
+)
 today = date.today().year
 past_years = [today, 2020, 2000, 1960, 1900, 1800, 1600, 1300, 600, 0, -2000]
 futures = [2020 - today, 0, 10, 20, 50, 100, 1e3, 1e4, 1e5]
@@ -22,6 +76,10 @@ logging.basicConfig(
     format="%(asctime)s [%(levelname)s] %(message)s",
 )
 
+if not data:
+    logging.error("No publication matches the filters.")
+    raise SystemExit(1)
+
 logging.info("📐 Initializing…")
 
 with rc_context(xkcd):
@@ -61,7 +119,7 @@ with rc_context(xkcd):
 
     # Y axis
     ax.set_ylabel("(设定时间 − 创作时间) / 年")
-    ax.set_ylim(-10e6, 31e6)  # Auto mode has too much margins
+    ax.set_ylim(*y_lim)
     ax.yaxis.set_tick_params(which="both", right=True, labelright=True)
     ax.set_yscale(WarpScale(ax.yaxis, linear_widths=(100, 20)))
     ax.yaxis.set_major_locator(AsinhLocator(linear_width=20, numticks=20))
@@ -74,14 +132,24 @@ with rc_context(xkcd):
     logging.info("📈 Drawing…")
 
     texts = []
+    # Publication of each text
+    owners = []
 
     for publication in data:
-        texts.extend(draw(publication, ax, color=next(palette)))
+        new_texts = draw(publication, ax, color=next(palette))
+        texts.extend(new_texts)
+        owners.extend([publication] * len(new_texts))
+
+    # Markers of events. (Bboxes of lines and ellipses are too coarse to avoid.)
+    obstacles = [line for line in ax.lines if len(line.get_xdata()) == 1]
+    # Lines, markers and ellipses, to avoid more accurately
+    shapes = [*ax.lines, *ax.patches]
 
     draw_areas(ax, past_years=past_years, futures=futures)
 
     logging.info("👻 Amending texts…")
-    amend(texts)
+    # Amended texts may have been filtered out
+    amend(texts, missing_ok=args.author is not None or args.name is not None)
 
     logging.info(
         "💾 Saving original version…"
@@ -89,18 +157,87 @@ with rc_context(xkcd):
     )
     fig.savefig("output-original.png")
 
-    logging.info("🔧 Adjusting texts…")
-    n_iter = adjust_text(
-        texts,
-        lim=15,
-        expand_text=(1.15, 1.3),
-        arrowprops=dict(
-            color="gray",
-            alpha=0.4,
-            arrowstyle="-",
-        ),
+    arrowprops = dict(
+        color="gray",
+        alpha=0.4,
+        arrowstyle="-",
+    )
+    adjust_options = dict(
+        lim=15, expand_text=(1.15, 1.3), levels=3, n_jobs=args.jobs, cull=args.cull
+    )
+    # Identify texts by their publications and initial layout, including amendments
+    labels = [
+        layout_key(p, t.get_text(), t.xyann, t.get_ha(), t.get_va())
+        for p, t in zip(owners, texts)
+    ]
+    # Everything but the data, so that only layouts of the same chart seed others
+    scope = layout_key(
+        data_filter,
+        past_years,
+        futures,
+        fig.get_size_inches().tolist(),
+        fig.dpi,
+        rcParams["font.family"],
+        adjust_options,
+        arrowprops,
+        LAYOUT_VERSION,
+        matplotlib_version,
     )
-    logging.info(f"🔧 Texts adjustment iterated {n_iter} time(s).")
+    key = layout_key(data, labels, scope)
+    cache_dir = Path(".cache/layouts")
+
+    # Lay out the figure before moving texts, as `adjust_text` does
+    renderer = prepare_figure(fig)
+    occupancy = OccupancyGrid.from_artists(shapes, ax, renderer)
+
+    if not args.relayout and load_layout(texts, key, cache_dir):
+        logging.info("🔧 Reusing the cached layout…")
+        add_arrows(
+            texts,
+            arrowprops,
+            ax,
+            renderer,
+            texts[0].get_transform(),
+            collection=True,
+        )
+    else:
+        warm_start = (
+            None if args.relayout else load_warm_start(labels, cache_dir, scope)
+        )
+        if warm_start is None:
+            logging.info("🔧 Adjusting texts…")
+        else:
+            n_warm = sum(w is not None for w in warm_start)
+            logging.info(f"🔧 Adjusting texts, {n_warm} of which start warm…")
+        with ExitStack() as stack:
+            trace = (
+                None
+                if args.trace is None
+                else stack.enter_context(args.trace.open("w", encoding="utf-8"))
+            )
+            result = adjust_text(
+                texts,
+                add_objects=obstacles,
+                arrowprops=arrowprops,
+                warm_start=warm_start,
+                callback=None if trace is None else JsonLines(trace),
+                progress=args.progress,
+                arrow_collection=True,
+                occupancy=occupancy,
+                **adjust_options,
+            )
+        logging.info(
+            f"🔧 Texts adjustment iterated {result.n_iter} time(s)"
+            f" in {result.elapsed:.1f} s."
+            f" Remaining overlaps: {result.overlap[0]:.0f} px (x),"
+            f" {result.overlap[1]:.0f} px (y)."
+        )
+        if result.culled:
+            logging.info(
+                f"🔧 Culled {len(result.culled)} text(s): "
+                + ", ".join(f"“{texts[i].get_text()}”" for i in result.culled)
+            )
+        save_layout(texts, key, cache_dir, labels=labels, scope=scope)
 
 logging.info("💾 Saving…")
 fig.savefig("output.png")
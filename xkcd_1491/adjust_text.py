@@ -15,26 +15,38 @@ instead of from old `xytext` to new `xytext`.
 
 from __future__ import annotations, division
 
+import json
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
 from itertools import product
-from operator import itemgetter
 from typing import TYPE_CHECKING
 
 import matplotlib
 import numpy as np
 from matplotlib import pyplot as plt
+from matplotlib.collections import LineCollection
 from matplotlib.path import get_path_collection_extents
+from matplotlib.transforms import Bbox, IdentityTransform
 from rich.progress import track
 
+from .steps import animation_writers, record_step, render_steps
+
 if TYPE_CHECKING:
+    from typing import Callable, TextIO
+
     from matplotlib.text import Annotation
 
+    from .occupancy import OccupancyGrid
 
-def get_bboxes_pathcollection(sc, ax):
-    """Function to return a list of bounding boxes in display coordinates
-    for a scatter plot
-    Thank you to ImportanceOfBeingErnest
-    https://stackoverflow.com/a/55007838/1304161"""
-    #    ax.figure.canvas.draw() # need to draw before the transforms are set.
+
+def get_extents_pathcollection(sc, ax):
+    """Return the (P, 4) extents of items of a PathCollection in display coordinates
+
+    If all items share a single path and transform, as in a usual scatter,
+    the extent of the path is computed once, then translated by every offset.
+    Otherwise, items are measured one by one.
+    """
     transform = sc.get_transform()
     trans_offset = sc.get_offset_transform()
     offsets = sc._offsets
@@ -51,23 +63,44 @@ def get_bboxes_pathcollection(sc, ax):
     if isinstance(offsets, np.ma.MaskedArray):
         offsets = offsets.filled(np.nan)
 
-    bboxes = []
-
-    if len(paths) and len(offsets):
-        if len(paths) < len(offsets):
-            # for usual scatters you have one path, but several offsets
-            paths = [paths[0]] * len(offsets)
-        if len(transforms) < len(offsets):
-            # often you may have a single scatter size, but several offsets
-            transforms = [transforms[0]] * len(offsets)
-
-        for p, o, t in zip(paths, offsets, transforms):
-            result = get_path_collection_extents(
+    if not (len(paths) and len(offsets)):
+        return np.empty((0, 4))
+
+    if len(paths) == 1 and len(transforms) <= 1:
+        # Same as below with `IdentityTransform` offsets, as the path is only
+        # translated by the offsets in display coordinates
+        extent = get_path_collection_extents(
+            transform.frozen(), paths, transforms, [(0, 0)], IdentityTransform()
+        ).extents
+        offsets = trans_offset.transform(np.asarray(offsets, dtype=float))
+        return extent + np.tile(offsets, 2)
+
+    if len(paths) < len(offsets):
+        # for usual scatters you have one path, but several offsets
+        paths = [paths[0]] * len(offsets)
+    if len(transforms) < len(offsets):
+        # often you may have a single scatter size, but several offsets
+        transforms = [transforms[0]] * len(offsets)
+
+    return get_extents(
+        [
+            get_path_collection_extents(
                 transform.frozen(), [p], [t], [o], trans_offset.frozen()
             )
-            bboxes.append(result)
+            for p, o, t in zip(paths, offsets, transforms)
+        ]
+    )
 
-    return bboxes
+
+def get_bboxes_pathcollection(sc, ax):
+    """Function to return a list of bounding boxes in display coordinates
+    for a scatter plot
+    Thank you to ImportanceOfBeingErnest
+    https://stackoverflow.com/a/55007838/1304161
+
+    See `get_extents_pathcollection` for an array version."""
+    #    ax.figure.canvas.draw() # need to draw before the transforms are set.
+    return [Bbox.from_extents(*e) for e in get_extents_pathcollection(sc, ax)]
 
 
 def get_text_position(text, ax):
@@ -127,6 +160,41 @@ def get_bboxes(objs, r=None, expand=(1, 1), ax=None, transform=None):
             return get_bboxes_pathcollection(objs, ax)
 
 
+def get_extents(bboxes):
+    """Stack bboxes into an (N, 4) array of (xmin, ymin, xmax, ymax)."""
+    if not len(bboxes):
+        return np.empty((0, 4))
+    return np.array([(b.xmin, b.ymin, b.xmax, b.ymax) for b in bboxes], dtype=float)
+
+
+def expand_extents(extents, expand=(1, 1)):
+    """Expand an (N, 4) array of extents about their centers, like `Bbox.expanded`."""
+    sw, sh = expand
+    width = extents[:, 2] - extents[:, 0]
+    height = extents[:, 3] - extents[:, 1]
+    deltaw = (sw * width - width) / 2.0
+    deltah = (sh * height - height) / 2.0
+    return extents + np.column_stack([-deltaw, -deltah, deltaw, deltah])
+
+
+def get_text_extents(texts, r=None, expand=(1, 1), ax=None, extents=None):
+    """Return the (N, 4) extents of texts, expanded by `expand`.
+
+    If the unexpanded `extents` are known, texts are not measured again.
+    """
+    if extents is None:
+        return get_extents(get_bboxes(texts, r, expand, ax=ax))
+    return expand_extents(extents, expand)
+
+
+def iter_chunks(n_rows, n_cols, max_size=2**20):
+    """Split rows into slices, so that a chunk of (rows, n_cols) has at most
+    `max_size` elements (but at least one row)."""
+    step = max(1, max_size // max(1, n_cols))
+    for start in range(0, n_rows, step):
+        yield slice(start, min(start + step, n_rows))
+
+
 def get_midpoint(bbox):
     cx = (bbox.x0 + bbox.x1) / 2
     cy = (bbox.y0 + bbox.y1) / 2
@@ -141,6 +209,11 @@ def get_points_inside_bbox(x, y, bbox):
     return np.asarray(np.where(x_in & y_in)[0])
 
 
+def maybe_track(sequence, progress=True, **kwargs):
+    """`rich.progress.track` if `progress` is True, else `sequence` itself"""
+    return track(sequence, **kwargs) if progress else sequence
+
+
 def get_renderer(fig):
     try:
         return fig.canvas.get_renderer()
@@ -148,6 +221,16 @@ def get_renderer(fig):
         return fig.canvas.renderer
 
 
+def prepare_figure(fig):
+    """Finalize the layout and transforms of a figure, and return its renderer
+
+    Unlike `plt.draw()`, artists are not rasterized, so it is much faster for
+    figures with many or complex artists. Texts can be measured afterwards.
+    """
+    fig.draw_without_rendering()
+    return get_renderer(fig)
+
+
 def overlap_bbox_and_point(bbox, xp, yp):
     """Given a bbox that contains a given point, return the (x, y) displacement
     necessary to make the bbox not overlap the point."""
@@ -173,18 +256,23 @@ def overlap_bbox_and_point(bbox, xp, yp):
 
 
 def move_texts(texts, delta_x, delta_y, bboxes=None, renderer=None, ax=None):
+    """Move texts, unless they would leave the axes
+
+    Return the displacements actually applied.
+    """
     ax = ax or plt.gca()
     if bboxes is None:
         r = renderer or get_renderer(ax.get_figure())
         bboxes = get_bboxes(texts, r, (1, 1), ax=ax)
+    extents = bboxes if isinstance(bboxes, np.ndarray) else get_extents(bboxes)
     ax_bbox = ax.patch.get_extents()
     xmin = ax_bbox.xmin
     xmax = ax_bbox.xmax
     ymin = ax_bbox.ymin
     ymax = ax_bbox.ymax
+    applied = np.zeros((2, len(texts)))
     for i, (text, dx, dy) in enumerate(zip(texts, delta_x, delta_y)):
-        bbox = bboxes[i]
-        x1, y1, x2, y2 = bbox.xmin, bbox.ymin, bbox.xmax, bbox.ymax
+        x1, y1, x2, y2 = extents[i]
         if x1 + dx < xmin:
             dx = 0
         if x2 + dx > xmax:
@@ -198,6 +286,184 @@ def move_texts(texts, delta_x, delta_y, bboxes=None, renderer=None, ax=None):
         newx = x + dx
         newy = y + dy
         set_text_position(text, newx, newy)
+        applied[:, i] = dx, dy
+    return tuple(applied)
+
+
+def move_extents(extents, delta_x, delta_y, ax=None):
+    """Array version of `move_texts`, updating (N, 4) `extents` in place.
+
+    Texts are not touched; use `sync_texts` to write positions back.
+    Return the displacements actually applied.
+    """
+    ax = ax or plt.gca()
+    ax_bbox = ax.patch.get_extents()
+    x0, y0, x1, y1 = extents.T
+    delta_x = np.where(
+        (x0 + delta_x < ax_bbox.xmin) | (x1 + delta_x > ax_bbox.xmax), 0, delta_x
+    )
+    delta_y = np.where(
+        (y0 + delta_y < ax_bbox.ymin) | (y1 + delta_y > ax_bbox.ymax), 0, delta_y
+    )
+    extents[:, [0, 2]] += delta_x[:, np.newaxis]
+    extents[:, [1, 3]] += delta_y[:, np.newaxis]
+    return delta_x, delta_y
+
+
+def sync_texts(texts, extents, synced_extents, ax=None):
+    """Move texts by how far `extents` have moved since `synced_extents`.
+
+    `synced_extents` is updated in place, so that it can be synced again later.
+    """
+    ax = ax or plt.gca()
+    shifts = extents[:, :2] - synced_extents[:, :2]
+    for text, (dx, dy) in zip(texts, shifts):
+        if dx or dy:
+            x, y = get_text_position(text, ax)
+            set_text_position(text, x + dx, y + dy)
+    synced_extents[:] = extents
+
+
+class TextExtentCache:
+    """LRU cache of texts' sizes in display coordinates
+
+    Laying out glyphs is slow, especially with fallback fonts, but a text's size
+    does not depend on its position or alignment. Sizes are cached by the text's
+    content, font, rotation and dpi, and the window extent for any alignment is
+    derived from the size and the position.
+
+    The cache can be shared across figures in the same process.
+    """
+
+    _h_offsets = {"left": 0, "center": 0.5, "right": 1}
+    _v_offsets = {"bottom": 0, "center": 0.5, "top": 1}
+
+    def __init__(self, maxsize=4096):
+        self.maxsize = maxsize
+        self._sizes: OrderedDict[tuple, tuple[float, float]] = OrderedDict()
+
+    def __len__(self):
+        return len(self._sizes)
+
+    def clear(self):
+        self._sizes.clear()
+
+    def get_window_extent(self, text, renderer, ha=None, va=None, ax=None):
+        """Return `text.get_window_extent(renderer)` as if aligned by (ha, va)
+
+        `ha` and `va` default to the text's current alignments.
+        The text's alignments are left unchanged.
+        """
+        ha = ha or text.get_ha()
+        va = va or text.get_va()
+        if not self._is_cacheable(text, renderer, ha, va):
+            old = text.get_ha(), text.get_va()
+            text.set_ha(ha)
+            text.set_va(va)
+            bbox = text.get_window_extent(renderer)
+            text.set_ha(old[0])
+            text.set_va(old[1])
+            return bbox
+
+        key = (
+            text.get_text(),
+            text.get_fontproperties(),
+            text.get_rotation(),
+            text._linespacing,
+            text.get_usetex(),
+            text.figure.dpi,
+        )
+        if key in self._sizes:
+            self._sizes.move_to_end(key)
+            width, height = self._sizes[key]
+        else:
+            bbox = text.get_window_extent(renderer)
+            width, height = bbox.width, bbox.height
+            # Setters such as `set_fontsize` change font properties in place, which
+            # would change the hash of a stored key
+            key = (key[0], key[1].copy(), *key[2:])
+            self._sizes[key] = width, height
+            if len(self._sizes) > self.maxsize:
+                self._sizes.popitem(last=False)
+
+        x, y = get_text_position(text, ax or text.axes)
+        x0 = x - self._h_offsets[ha] * width
+        y0 = y - self._v_offsets[va] * height
+        return Bbox.from_bounds(x0, y0, width, height)
+
+    def _is_cacheable(self, text, renderer, ha, va):
+        """Whether the extent can be derived from the size"""
+        return (
+            ha in self._h_offsets
+            and va in self._v_offsets
+            and text.get_rotation_mode() != "anchor"
+            and text.get_visible()
+            and text.get_text() != ""
+            and getattr(text, "arrow_patch", None) is None
+            and (not hasattr(text, "_check_xy") or text._check_xy(renderer))
+        )
+
+
+text_extent_cache = TextExtentCache()
+
+
+def get_alignment_costs(candidates, expand, boxes, x, y, ax_extent, exclude=None):
+    """Return the costs of candidate alignments of texts
+
+    Parameters
+    ----------
+    candidates : (K, A, 4) array
+        Extents of K texts, each aligned in A ways.
+    expand : (float, float)
+        How much to expand candidates when looking for points and boxes.
+    boxes : (B, 4) array
+        Extents of boxes to avoid, e.g. expanded texts and other objects.
+    x, y : arrays
+        Points to avoid.
+    ax_extent : (xmin, ymin, xmax, ymax)
+        Extent of the axes.
+    exclude : (K,) int array, optional
+        Index of each text in `boxes`, so that it does not avoid itself.
+
+    Returns
+    -------
+    axout, n_points, areas : (K, A) arrays
+        Whether candidates leave the axes, numbers of points strictly inside
+        expanded candidates, and total areas of their intersections with boxes.
+        Areas are summed in the order of boxes, as the built-in `sum` would.
+    """
+    n, n_alignments = candidates.shape[:2]
+    x0, y0, x1, y1 = np.moveaxis(candidates, -1, 0)
+    axout = (
+        (x0 < ax_extent[0])
+        | (x1 > ax_extent[2])
+        | (y0 < ax_extent[1])
+        | (y1 > ax_extent[3])
+    )
+
+    flat = expand_extents(candidates.reshape(-1, 4), expand)
+    owners = np.repeat(np.arange(n), n_alignments)
+    n_points = np.zeros(len(flat), dtype=int)
+    areas = np.zeros(len(flat))
+    bx0, by0, bx1, by1 = boxes.T
+    for chunk in iter_chunks(len(flat), max(len(x), len(boxes))):
+        x0, y0, x1, y1 = (e[:, np.newaxis] for e in flat[chunk].T)
+        n_points[chunk] = np.sum((x > x0) & (x < x1) & (y > y0) & (y < y1), axis=1)
+        if not len(boxes):
+            continue
+        # Same as `Bbox.intersection`
+        overlaps_x = np.minimum(x1, bx1) - np.maximum(x0, bx0)
+        overlaps_y = np.minimum(y1, by1) - np.maximum(y0, by0)
+        intersections = np.where(
+            (overlaps_x >= 0) & (overlaps_y >= 0), np.abs(overlaps_x * overlaps_y), 0
+        )
+        if exclude is not None:
+            intersections[np.arange(len(intersections)), exclude[owners[chunk]]] = 0
+        # Cumulative sums are sequential, unlike the pairwise `np.sum`
+        areas[chunk] = np.cumsum(intersections, axis=1)[:, -1]
+
+    shape = (n, n_alignments)
+    return axout, n_points.reshape(shape), areas.reshape(shape)
 
 
 def optimally_align_text(
@@ -209,19 +475,36 @@ def optimally_align_text(
     renderer=None,
     ax=None,
     direction="xy",
+    extent_cache: TextExtentCache | None = text_extent_cache,
+    rows=None,
+    progress=True,
+    sequential=True,
+    deadline: float | None = None,
 ):
     """
     For all text objects find alignment that causes the least overlap with
     points and other texts and apply it
+
+    Sizes of texts are looked up in `extent_cache` if provided,
+    so that each text is laid out only once.
+    If a boolean mask `rows` is given, only texts with `rows[i]` are aligned,
+    but the others are still avoided.
+    A progress bar is shown if `progress` is True.
+
+    Candidates of all texts and alignments are measured as one array, and their
+    costs are computed by `get_alignment_costs`. If `sequential` is True, texts
+    are aligned one by one, each avoiding texts as aligned so far. Otherwise,
+    all texts are aligned at once, each avoiding texts as they were before,
+    which is faster but differs from the original algorithm.
+
+    If `deadline` (in `time.perf_counter()`) is given, texts not yet aligned by
+    then keep their alignments.
     """
     ax = ax or plt.gca()
     r = renderer or get_renderer(ax.get_figure())
-    ax_bbox = ax.patch.get_extents()
-    xmin = ax_bbox.xmin
-    xmax = ax_bbox.xmax
-    ymin = ax_bbox.ymin
-    ymax = ax_bbox.ymax
-    bboxes = get_bboxes(texts, r, expand, ax=ax)
+    ax_extent = ax.patch.get_extents().extents
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
     if "x" not in direction:
         ha = [""]
     else:
@@ -231,52 +514,245 @@ def optimally_align_text(
     else:
         va = ["bottom", "top", "center"]
     alignment = list(product(ha, va))
-    #    coords = np.array(zip(x, y))
-    for i, text in track(
-        enumerate(texts), description="Optimally aligning texts", total=len(texts)
+    indices = get_row_indices(len(texts), rows)
+
+    # Expanded texts, then other objects
+    boxes = np.concatenate(
+        [
+            get_extents(get_bboxes(texts, r, expand, ax=ax)),
+            get_extents(add_bboxes),
+        ]
+    )
+
+    def measure(text, h, v):
+        if extent_cache is not None:
+            return extent_cache.get_window_extent(text, r, h, v, ax=ax).extents
+        if h:
+            text.set_ha(h)
+        if v:
+            text.set_va(v)
+        return text.get_window_extent(r).extents
+
+    candidates = np.array(
+        [[measure(texts[i], h, v) for h, v in alignment] for i in indices]
+    ).reshape(len(indices), len(alignment), 4)
+
+    def apply(i, a):
+        """Align text i in the a-th way"""
+        if "x" in direction:
+            texts[i].set_ha(alignment[a][0])
+        if "y" in direction:
+            texts[i].set_va(alignment[a][1])
+
+    if not sequential:
+        axout, n_points, areas = get_alignment_costs(
+            candidates, expand, boxes, x, y, ax_extent, exclude=indices
+        )
+        # Stable, so ties are broken by the order of alignments
+        best = np.lexsort((areas, n_points, axout), axis=-1)[:, 0]
+        for i, a in zip(indices, best):
+            apply(i, a)
+        return texts
+
+    for k, i in maybe_track(
+        enumerate(indices),
+        progress,
+        description="Optimally aligning texts",
+        total=len(indices),
     ):
-        #        tcoords = np.array(text.get_position()).T
-        #        nonself_coords = coords[~np.all(coords==tcoords, axis=1)]
-        #        nonself_x, nonself_y = np.split(nonself_coords, 2, axis=1)
-        counts = []
-        for h, v in alignment:
-            if h:
-                text.set_ha(h)
-            if v:
-                text.set_va(v)
-            bbox = text.get_window_extent(r).expanded(*expand)
-            c = len(get_points_inside_bbox(x, y, bbox))
-            intersections = [
-                bbox.intersection(bbox, bbox2) if i != j else None
-                for j, bbox2 in enumerate(bboxes + add_bboxes)
-            ]
-            intersections = sum(
-                [abs(b.width * b.height) if b is not None else 0 for b in intersections]
-            )
-            # Check for out-of-axes position
-            bbox = text.get_window_extent(r)
-            x1, y1, x2, y2 = bbox.xmin, bbox.ymin, bbox.xmax, bbox.ymax
-            if x1 < xmin or x2 > xmax or y1 < ymin or y2 > ymax:
-                axout = 1
-            else:
-                axout = 0
-            counts.append((axout, c, intersections))
+        if deadline is not None and time.perf_counter() >= deadline:
+            break
+        axout, n_points, areas = get_alignment_costs(
+            candidates[[k]], expand, boxes, x, y, ax_extent, exclude=np.array([i])
+        )
         # Most important: prefer alignments that keep the text inside the axes.
         # If tied, take the alignments that minimize the number of x, y points
         # contained inside the text.
         # Break any remaining ties by minimizing the total area of intersections
         # with all text bboxes and other objects to avoid.
-        a, value = min(enumerate(counts), key=itemgetter(1))
-        if "x" in direction:
-            text.set_ha(alignment[a][0])
-        if "y" in direction:
-            text.set_va(alignment[a][1])
-        bboxes[i] = text.get_window_extent(r).expanded(*expand)
+        a = min(
+            range(len(alignment)),
+            key=lambda a: (axout[0, a], n_points[0, a], areas[0, a]),
+        )
+        apply(i, a)
+        boxes[i] = expand_extents(candidates[k, [a]], expand)[0]
     return texts
 
 
+def get_candidate_pairs(extents, rows=None):
+    """Return the index pairs (i, j), i != j, of boxes sharing a grid cell.
+
+    A uniform grid with cells about the size of a median box is laid over
+    the boxes, so boxes that overlap always share at least one cell.
+    If a boolean mask `rows` is given, only pairs with `rows[i]` are returned.
+    Pairs are unique and sorted by i, then j.
+    """
+    n = len(extents)
+    if n < 2:
+        return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.intp)
+    x0, y0, x1, y1 = extents.T
+    cell_w = np.median(x1 - x0)
+    cell_h = np.median(y1 - y0)
+    cell_w = cell_w if cell_w > 0 else 1.0
+    cell_h = cell_h if cell_h > 0 else 1.0
+    ox, oy = x0.min(), y0.min()
+    cx0 = np.floor((x0 - ox) / cell_w).astype(np.intp)
+    cx1 = np.floor((x1 - ox) / cell_w).astype(np.intp)
+    cy0 = np.floor((y0 - oy) / cell_h).astype(np.intp)
+    cy1 = np.floor((y1 - oy) / cell_h).astype(np.intp)
+
+    # Enumerate every (cell, box) incidence, sorted by cell
+    n_cols = cx1 - cx0 + 1
+    counts = n_cols * (cy1 - cy0 + 1)
+    box = np.repeat(np.arange(n), counts)
+    local = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    cell = (cx0[box] + local % n_cols[box]) * (cy1.max() + 1) + (
+        cy0[box] + local // n_cols[box]
+    )
+    order = np.argsort(cell, kind="stable")
+    cell, box = cell[order], box[order]
+
+    # Pair up each incidence of a row with every incidence in the same cell
+    selected = np.arange(len(box)) if rows is None else np.flatnonzero(rows[box])
+    starts = np.searchsorted(cell, cell[selected], side="left")
+    sizes = np.searchsorted(cell, cell[selected], side="right") - starts
+    local = np.arange(sizes.sum()) - np.repeat(np.cumsum(sizes) - sizes, sizes)
+    i = np.repeat(box[selected], sizes)
+    j = box[np.repeat(starts, sizes) + local]
+
+    keys = np.unique(i[i != j] * n + j[i != j])
+    return keys // n, keys % n
+
+
+def get_row_indices(n, rows=None):
+    """Indices of a boolean mask `rows` over n items, or all indices if None"""
+    return np.arange(n) if rows is None else np.flatnonzero(rows)
+
+
+def get_overlapping_pairs(extents, rows=None):
+    """Return the pairs (i, j) of texts where j repels i, and their overlaps
+
+    See `repel_extents` for the parameters.
+
+    Returns
+    -------
+    i, j, overlaps_x, overlaps_y : (P,) arrays
+        Pairs sorted by i, then j, and their overlaps along x and y.
+    """
+    i, j = get_candidate_pairs(extents, rows)
+
+    x0, y0, x1, y1 = extents.T
+    x_in = ((x0[j] > x0[i]) & (x0[j] < x1[i])) | ((x1[j] > x0[i]) & (x1[j] < x1[i]))
+    y_in = ((y0[j] > y0[i]) & (y0[j] < y1[i])) | ((y1[j] > y0[i]) & (y1[j] < y1[i]))
+    i, j = i[x_in & y_in], j[x_in & y_in]
+
+    overlaps_x = np.minimum(x1[i], x1[j]) - np.maximum(x0[i], x0[j])
+    overlaps_y = np.minimum(y1[i], y1[j]) - np.maximum(y0[i], y0[j])
+    return i, j, overlaps_x, overlaps_y
+
+
+def repel_extents(extents, rows=None):
+    """Array version of `repel_text`
+
+    Parameters
+    ----------
+    extents : (N, 4) array
+        Expanded extents of texts.
+    rows : (N,) bool array, optional
+        Only compute texts in `rows`. Other texts still repel them.
+
+    Returns
+    -------
+    delta_x, delta_y, overlaps_x, overlaps_y : (N,) arrays
+        Displacements and total overlaps of every text, zero outside `rows`.
+    """
+    n = len(extents)
+    i, j, overlaps_x, overlaps_y = get_overlapping_pairs(extents, rows)
+    x0, y0 = extents[:, 0], extents[:, 1]
+    move_x = overlaps_x * np.sign(x0[i] - x0[j])
+    move_y = overlaps_y * np.sign(y0[i] - y0[j])
+
+    return (
+        np.bincount(i, weights=move_x, minlength=n),
+        np.bincount(i, weights=move_y, minlength=n),
+        np.bincount(i, weights=overlaps_x, minlength=n),
+        np.bincount(i, weights=overlaps_y, minlength=n),
+    )
+
+
+def repel_extents_from_bboxes(add_extents, extents, rows=None):
+    """Array version of `repel_text_from_bboxes`
+
+    `add_extents` is an (M, 4) array. See `repel_extents` for other parameters
+    and the returns.
+    """
+    bx0, by0, bx1, by1 = add_extents.T
+    result = np.zeros((4, len(extents)))
+    indices = get_row_indices(len(extents), rows)
+    for chunk in iter_chunks(len(indices), len(add_extents)):
+        chunk = indices[chunk]
+        x0, y0, x1, y1 = (e[:, np.newaxis] for e in extents[chunk].T)
+        # Intervals overlap (or touch) along both axes, like `Bbox.intersection`
+        overlaps_x = np.minimum(x1, bx1) - np.maximum(x0, bx0)
+        overlaps_y = np.minimum(y1, by1) - np.maximum(y0, by0)
+        i, j = np.nonzero((overlaps_x >= 0) & (overlaps_y >= 0))
+        overlaps_x = overlaps_x[i, j]
+        overlaps_y = overlaps_y[i, j]
+
+        move_x = overlaps_x * np.sign(extents[chunk][i, 0] - bx0[j])
+        move_y = overlaps_y * np.sign(extents[chunk][i, 1] - by0[j])
+
+        for k, weights in enumerate([move_x, move_y, overlaps_x, overlaps_y]):
+            result[k, chunk] = np.bincount(i, weights=weights, minlength=len(chunk))
+    return tuple(result)
+
+
+def repel_extents_from_points(x, y, extents, rows=None):
+    """Array version of `repel_text_from_points`
+
+    `x` and `y` are arrays of points. See `repel_extents` for other parameters
+    and the returns, except that overlaps are absolute displacements here.
+    """
+    result = np.zeros((4, len(extents)))
+    indices = get_row_indices(len(extents), rows)
+    for chunk in iter_chunks(len(indices), len(x)):
+        chunk = indices[chunk]
+        x0, y0, x1, y1 = (e[:, np.newaxis] for e in extents[chunk].T)
+        i, j = np.nonzero((x > x0) & (x < x1) & (y > y0) & (y < y1))
+        x0, y0, x1, y1 = extents[chunk][i].T
+        xp, yp = x[j], y[j]
+
+        # Same as `overlap_bbox_and_point`, for all pairs (i, j) at once
+        dir_x = np.sign((x0 + x1) / 2 - xp)
+        dir_y = np.sign((y0 + y1) / 2 - yp)
+        move_x = np.select([dir_x == -1, dir_x == 1], [xp - x1, xp - x0], 0)
+        move_y = np.select([dir_y == -1, dir_y == 1], [yp - y1, yp - y0], 0)
+
+        for k, weights in enumerate([move_x, move_y, np.abs(move_x), np.abs(move_y)]):
+            result[k, chunk] = np.bincount(i, weights=weights, minlength=len(chunk))
+    return tuple(result)
+
+
+def get_disturbed(extents, moving):
+    """Return a mask of boxes overlapping any box in the boolean mask `moving`"""
+    i, j = get_candidate_pairs(extents, moving)
+    x0, y0, x1, y1 = extents.T
+    overlap = (np.minimum(x1[i], x1[j]) >= np.maximum(x0[i], x0[j])) & (
+        np.minimum(y1[i], y1[j]) >= np.maximum(y0[i], y0[j])
+    )
+    disturbed = np.zeros(len(extents), dtype=bool)
+    disturbed[j[overlap]] = True
+    return disturbed
+
+
 def repel_text(
-    texts, renderer=None, ax=None, expand=(1.2, 1.2), only_use_max_min=False, move=False
+    texts,
+    renderer=None,
+    ax=None,
+    expand=(1.2, 1.2),
+    only_use_max_min=False,
+    move=False,
+    extents=None,
 ):
     """
     Repel texts from each other while expanding their bounding boxes by expand
@@ -284,42 +760,19 @@ def repel_text(
     Requires a renderer to get the actual sizes of the text, and to that end
     either one needs to be directly provided, or the axes have to be specified,
     and the renderer is then got from the axes object.
+    Alternatively, pass the unexpanded `extents` of texts to skip measuring.
+
+    Only pairs of texts sharing a grid cell are tested (see `get_candidate_pairs`),
+    and a text j repels text i if a corner of j lies inside i.
     """
     ax = ax or plt.gca()
     r = renderer or get_renderer(ax.get_figure())
-    bboxes = get_bboxes(texts, r, expand, ax=ax)
-    xmins = [bbox.xmin for bbox in bboxes]
-    xmaxs = [bbox.xmax for bbox in bboxes]
-    ymaxs = [bbox.ymax for bbox in bboxes]
-    ymins = [bbox.ymin for bbox in bboxes]
-
-    overlaps_x = np.zeros((len(bboxes), len(bboxes)))
-    overlaps_y = np.zeros_like(overlaps_x)
-    overlap_directions_x = np.zeros_like(overlaps_x)
-    overlap_directions_y = np.zeros_like(overlaps_y)
-    for i, bbox1 in enumerate(bboxes):
-        overlaps = get_points_inside_bbox(
-            xmins * 2 + xmaxs * 2, (ymins + ymaxs) * 2, bbox1
-        ) % len(bboxes)
-        overlaps = np.unique(overlaps)
-        for j in overlaps:
-            bbox2 = bboxes[j]
-            x, y = bbox1.intersection(bbox1, bbox2).size
-            overlaps_x[i, j] = x
-            overlaps_y[i, j] = y
-            direction = np.sign(bbox1.extents - bbox2.extents)[:2]
-            overlap_directions_x[i, j] = direction[0]
-            overlap_directions_y[i, j] = direction[1]
-
-    move_x = overlaps_x * overlap_directions_x
-    move_y = overlaps_y * overlap_directions_y
-
-    delta_x = move_x.sum(axis=1)
-    delta_y = move_y.sum(axis=1)
+    extents = get_text_extents(texts, r, expand, ax=ax, extents=extents)
+    delta_x, delta_y, overlaps_x, overlaps_y = repel_extents(extents)
 
     q = np.sum(overlaps_x), np.sum(overlaps_y)
     if move:
-        move_texts(texts, delta_x, delta_y, bboxes, ax=ax)
+        move_texts(texts, delta_x, delta_y, extents, ax=ax)
     return delta_x, delta_y, q
 
 
@@ -331,6 +784,7 @@ def repel_text_from_bboxes(
     expand=(1.2, 1.2),
     only_use_max_min=False,
     move=False,
+    extents=None,
 ):
     """
     Repel texts from other objects' bboxes while expanding their (texts')
@@ -339,43 +793,30 @@ def repel_text_from_bboxes(
     Requires a renderer to get the actual sizes of the text, and to that end
     either one needs to be directly provided, or the axes have to be specified,
     and the renderer is then got from the axes object.
+    Alternatively, pass the unexpanded `extents` of texts to skip measuring.
+
+    `add_bboxes` can be a list of bboxes, or an (M, 4) array of their extents.
+    Texts and bboxes are tested against each other in chunks of texts,
+    see `iter_chunks`.
     """
     ax = ax or plt.gca()
     r = renderer or get_renderer(ax.get_figure())
 
-    bboxes = get_bboxes(texts, r, expand, ax=ax)
-
-    overlaps_x = np.zeros((len(bboxes), len(add_bboxes)))
-    overlaps_y = np.zeros_like(overlaps_x)
-    overlap_directions_x = np.zeros_like(overlaps_x)
-    overlap_directions_y = np.zeros_like(overlaps_y)
-
-    for i, bbox1 in enumerate(bboxes):
-        for j, bbox2 in enumerate(add_bboxes):
-            try:
-                x, y = bbox1.intersection(bbox1, bbox2).size
-                direction = np.sign(bbox1.extents - bbox2.extents)[:2]
-                overlaps_x[i, j] = x
-                overlaps_y[i, j] = y
-                overlap_directions_x[i, j] = direction[0]
-                overlap_directions_y[i, j] = direction[1]
-            except AttributeError:
-                pass
-
-    move_x = overlaps_x * overlap_directions_x
-    move_y = overlaps_y * overlap_directions_y
-
-    delta_x = move_x.sum(axis=1)
-    delta_y = move_y.sum(axis=1)
+    extents = get_text_extents(texts, r, expand, ax=ax, extents=extents)
+    if not isinstance(add_bboxes, np.ndarray):
+        add_bboxes = get_extents(add_bboxes)
+    delta_x, delta_y, overlaps_x, overlaps_y = repel_extents_from_bboxes(
+        add_bboxes, extents
+    )
 
     q = np.sum(overlaps_x), np.sum(overlaps_y)
     if move:
-        move_texts(texts, delta_x, delta_y, bboxes, ax=ax)
+        move_texts(texts, delta_x, delta_y, extents, ax=ax)
     return delta_x, delta_y, q
 
 
 def repel_text_from_points(
-    x, y, texts, renderer=None, ax=None, expand=(1.2, 1.2), move=False
+    x, y, texts, renderer=None, ax=None, expand=(1.2, 1.2), move=False, extents=None
 ):
     """
     Repel texts from all points specified by x and y while expanding their
@@ -384,29 +825,22 @@ def repel_text_from_points(
     Requires a renderer to get the actual sizes of the text, and to that end
     either one needs to be directly provided, or the axes have to be specified,
     and the renderer is then got from the axes object.
+    Alternatively, pass the unexpanded `extents` of texts to skip measuring.
+
+    Texts and points are tested against each other in chunks of texts,
+    see `iter_chunks`.
     """
     assert len(x) == len(y)
     ax = ax or plt.gca()
     r = renderer or get_renderer(ax.get_figure())
-    bboxes = get_bboxes(texts, r, expand, ax=ax)
-
-    # move_x[i,j] is the x displacement of the i'th text caused by the j'th point
-    move_x = np.zeros((len(bboxes), len(x)))
-    move_y = np.zeros((len(bboxes), len(x)))
-    for i, bbox in enumerate(bboxes):
-        xy_in = get_points_inside_bbox(x, y, bbox)
-        for j in xy_in:
-            xp, yp = x[j], y[j]
-            dx, dy = overlap_bbox_and_point(bbox, xp, yp)
-
-            move_x[i, j] = dx
-            move_y[i, j] = dy
+    extents = get_text_extents(texts, r, expand, ax=ax, extents=extents)
+    delta_x, delta_y, moves_x, moves_y = repel_extents_from_points(
+        np.asarray(x, dtype=float), np.asarray(y, dtype=float), extents
+    )
 
-    delta_x = move_x.sum(axis=1)
-    delta_y = move_y.sum(axis=1)
-    q = np.sum(np.abs(move_x)), np.sum(np.abs(move_y))
+    q = np.sum(moves_x), np.sum(moves_y)
     if move:
-        move_texts(texts, delta_x, delta_y, bboxes, ax=ax)
+        move_texts(texts, delta_x, delta_y, extents, ax=ax)
     return delta_x, delta_y, q
 
 
@@ -440,6 +874,92 @@ def repel_text_from_axes(texts, ax=None, bboxes=None, renderer=None, expand=None
     return texts
 
 
+def get_anchor_position(text, renderer):
+    """Return the point annotated by `text` in display coordinates"""
+    return text._get_xy_transform(renderer, text.xycoords).transform(text.xy)
+
+
+def get_leader_lines(extents, anchors, shrink_a=0.0, shrink_b=0.0):
+    """Return (N, 2, 2) segments from the borders of boxes to their anchors
+
+    Segments point from the centers of `extents` to `anchors`, clipped by the
+    boxes like `patchA` of an arrow, then shrunk by `shrink_a` at the box and
+    `shrink_b` at the anchor. A segment collapses to a point if nothing is left,
+    e.g. when its anchor is inside its box.
+    """
+    centers = (extents[:, :2] + extents[:, 2:]) / 2
+    half_sizes = (extents[:, 2:] - extents[:, :2]) / 2
+    directions = anchors - centers
+    lengths = np.maximum(np.hypot(*directions.T), np.finfo(float).tiny)
+
+    # Fractions of directions where segments leave boxes
+    with np.errstate(divide="ignore"):
+        borders = np.min(np.abs(half_sizes / directions), axis=1)
+    starts = borders + shrink_a / lengths
+    ends = np.maximum(starts, 1 - shrink_b / lengths)
+    fractions = np.minimum(np.column_stack([starts, ends]), 1)
+    return (
+        centers[:, np.newaxis] + fractions[..., np.newaxis] * directions[:, np.newaxis]
+    )
+
+
+def add_arrows(
+    texts, arrowprops, ax, renderer, transform, *args, collection=False, **kwargs
+):
+    """Add arrows from texts to the points they annotate
+
+    `args` and `kwargs` are passed to `ax.annotate`.
+
+    If `collection` is True, straight lines are added as a single
+    `LineCollection` instead, which is much cheaper to draw. `arrowprops` are
+    passed to it then, except for `shrinkA` and `shrinkB` (in points) and other
+    properties of `FancyArrowPatch`. `args` and `kwargs` are ignored.
+
+    Hidden texts get no arrows.
+    """
+    texts = [text for text in texts if text.get_visible()]
+    if not texts:
+        return
+    bboxes = get_bboxes(texts, renderer, (1, 1), ax)
+    if collection:
+        props = dict(arrowprops)
+        shrink_a, shrink_b = (
+            renderer.points_to_pixels(props.pop(key, 2))
+            for key in ("shrinkA", "shrinkB")
+        )
+        for key in ("arrowstyle", "connectionstyle", "patchA", "patchB", "relpos"):
+            props.pop(key, None)
+        # Defaults of `FancyArrowPatch`
+        props.setdefault("linewidth", matplotlib.rcParams["patch.linewidth"])
+        props.setdefault("zorder", texts[0].get_zorder())
+
+        segments = get_leader_lines(
+            get_extents(bboxes),
+            np.array([get_anchor_position(text, renderer) for text in texts]),
+            shrink_a,
+            shrink_b,
+        )
+        lines = LineCollection(
+            transform.inverted().transform(segments.reshape(-1, 2)).reshape(-1, 2, 2),
+            transform=transform,
+            **props,
+        )
+        ax.add_collection(lines, autolim=False)
+        return
+    for bbox, text in zip(bboxes, texts):
+        ap = {"patchA": text}  # Ensure arrow is clipped by the text
+        ap.update(arrowprops)  # Add arrowprops from kwargs
+        ax.annotate(
+            "",  # Add an arrow from the text to the point
+            xy=text.xy,
+            xytext=transform.inverted().transform(get_midpoint(bbox)),
+            arrowprops=ap,
+            textcoords=transform,
+            *args,
+            **kwargs,
+        )
+
+
 def float_to_tuple(a):
     try:
         a = float(a)
@@ -453,6 +973,33 @@ def float_to_tuple(a):
         return b
 
 
+class JsonLines:
+    """Write telemetry of `adjust_text` to a file as JSON lines
+
+    Use an instance as the `callback`.
+    """
+
+    def __init__(self, file: TextIO) -> None:
+        self.file = file
+
+    def __call__(self, record: dict) -> None:
+        self.file.write(json.dumps(record) + "\n")
+
+
+@dataclass
+class AdjustResult:
+    """What `adjust_text` did"""
+
+    n_iter: int
+    """Number of iterations"""
+    elapsed: float
+    """Wall-clock time in seconds"""
+    overlap: tuple[float, float]
+    """Total overlaps along x and y of the final layout"""
+    culled: list[int] = field(default_factory=list)
+    """Indices of texts hidden by culling"""
+
+
 def adjust_text(
     texts: list[Annotation],
     x=None,
@@ -479,6 +1026,22 @@ def adjust_text(
     save_prefix="",
     save_format="png",
     add_step_numbers=True,
+    save_jobs: int | None = None,
+    measure_once=False,
+    freeze_settled=False,
+    settle_tol=0.5,
+    time_budget: float | None = None,
+    engine: str | Callable = "force",
+    warm_start: list | None = None,
+    n_jobs: int | None = None,
+    levels=1,
+    callback: Callable[[dict], None] | None = None,
+    progress=True,
+    arrow_collection=False,
+    occupancy: OccupancyGrid | None = None,
+    cull: float | None = None,
+    priorities=None,
+    align_sequentially=True,
     *args,
     **kwargs,
 ):
@@ -565,14 +1128,107 @@ def adjust_text(
     avoid_self : bool, default True
         whether to repel texts from its original positions.
     save_steps : bool, default False
-        whether to save intermediate steps as images.
+        whether to save intermediate steps as images. Steps are recorded while
+        adjusting, and rendered afterwards, see `steps.render_steps`. Rendering
+        is not counted in the elapsed time.
     save_prefix : str, default ''
         if `save_steps` is True, a path and/or prefix to the saved steps.
     save_format : str, default 'png'
-        if `save_steps` is True, a format to save the steps into.
+        if `save_steps` is True, a format to save the steps into. 'gif' and
+        'mp4' save all steps as one animation.
     add_step_numbers : bool, default True
         if `save_steps` is True, whether to add step numbers as titles to the
-        images of saving steps.
+        images of saving steps. The final layout, with arrows, is then saved as
+        `final` too, unless steps are saved as an animation.
+    save_jobs : int, optional
+        if `save_steps` is True, render steps in this many processes.
+    measure_once : bool, default False
+        whether to measure texts only once before iterating. Boxes are then
+        kept in an array and moved in place, and texts are moved only after
+        iterating (or when saving a step). This assumes that moving a text
+        does not change its size in display coordinates.
+    freeze_settled : bool, default False
+        whether to stop moving texts that have settled. A text settles once it
+        moves no more than `settle_tol` along both x and y in an iteration; it
+        then only repels others, until a moving text overlaps it. Implies
+        `measure_once`.
+    settle_tol : float, default 0.5
+        if `freeze_settled` is True, the displacement in display units below
+        which a text is considered settled.
+    time_budget : float, optional
+        if given, stop iterating after this many seconds (counted from calling
+        adjust_text), and keep the layout with the least total overlap seen so
+        far instead of the last one. Autoaligning, coarse levels and clusters
+        solved in parallel stop at the deadline as well, but starting
+        processes for clusters takes a while.
+    engine : str or callable, default 'force'
+        how to place texts.
+        - 'force', iteratively repel texts as described above,
+        - 'greedy', greedily select one of 8 candidate positions around each
+          point, see `placement.place_greedy`,
+        - 'anneal', select candidate positions by simulated annealing, see
+          `placement.place_annealing`,
+        - a callable, see `placement` for its signature.
+        Parameters about iterating and aligning only apply to 'force'.
+    warm_start : list, optional
+        the previously adjusted `(position, ha, va)` of each text, or None for
+        texts that are new or changed. Texts with a previous layout start from
+        it, and are neither autoaligned nor moved unless other texts disturb
+        them. Those overlapping new texts at the beginning are adjusted from
+        scratch as well. Implies `freeze_settled`.
+    n_jobs : int, optional
+        if given, split texts into clusters that overlap each other, and
+        adjust the clusters in parallel in this many processes, see
+        `clusters.solve_clusters`. Warm-started texts stay where they are.
+        Parameters about saving steps, settling and the time budget do not
+        apply then.
+    levels : int, default 1
+        number of resolution levels. Before iterating on texts, the extents of
+        texts are solved as arrays, without measuring texts again, with forces
+        and `precision` scaled by 2 ** (levels - 1), …, 4, 2. Each level is
+        seeded from the previous one. Coarse levels take long strides to
+        untangle texts, so that fewer iterations on texts are needed.
+        Warm-started texts stay where they are on coarse levels.
+    callback : callable, optional
+        if given, called with a dict of telemetry after each autoaligning pass,
+        each coarse level and each iteration, see `JsonLines` for an example.
+        Records of passes have `stage` 'align', `pass` and `seconds`. Records
+        of levels have `stage` 'coarse', `level`, `iterations` and `seconds`,
+        where level 0 would be the full resolution. Records of iterations have
+        `stage` 'iterate', and
+        - `iteration`, counted from 1,
+        - `elapsed`, seconds since calling adjust_text,
+        - `seconds`, spent in this iteration,
+        - `measure`, `text`, `points` and `objects`, seconds spent measuring
+          texts and repelling them from texts, points and objects,
+        - `overlap_x` and `overlap_y`, as compared with `precision`,
+        - `active`, number of texts moved in this iteration,
+        - `max_displacement`, in display units.
+    progress : bool, default True
+        whether to show progress bars.
+    arrow_collection : bool, default False
+        if True, draw arrows as straight lines in a single `LineCollection`
+        rather than an annotation per text, see `add_arrows`.
+    occupancy : OccupancyGrid, optional
+        if given, shapes such as lines and ellipses to avoid, see `occupancy`.
+        Iterations, coarse levels and clusters solved in parallel push texts
+        away from occupied cells, with `force_objects`, and placement engines
+        penalize occupied candidates. Autoaligning does not take it into
+        account, as it would only trade overlaps of texts for shapes before
+        iterating.
+    cull : float, optional
+        if given, hide texts after adjusting, lowest priority first, until no
+        text overlaps others, points and objects by more than this amount
+        along x and y in total, in display units. Among texts of the same
+        priority, the most overlapping one is hidden first. Hidden texts get no
+        arrows, and are reported in the result.
+    priorities : array_like, optional
+        priority of each text for culling, higher is kept longer. The default
+        is the font size, so that titles outrank small labels.
+    align_sequentially : bool, default True
+        whether autoaligning aligns texts one by one, each avoiding texts
+        aligned before it. If False, all texts are aligned at once against
+        their previous alignments, which is faster but gives other layouts.
     args and kwargs :
         any arguments will be fed into obj:`ax.annotate` after all the
         optimization is done just for plotting the connecting arrows if
@@ -580,12 +1236,13 @@ def adjust_text(
 
     Return
     ------
-    int
-        Number of iteration
+    AdjustResult
+        Number of iterations, elapsed time and the final overlap.
     """
-    plt.draw()
+    start = time.perf_counter()
+    deadline = None if time_budget is None else start + time_budget
     ax = ax or plt.gca()
-    r = get_renderer(ax.get_figure())
+    r = prepare_figure(ax.get_figure())
     transform = texts[0].get_transform()
     if (x is not None) & (y is not None):
         for ix, tupxy in enumerate(zip(x, y)):
@@ -638,20 +1295,185 @@ def adjust_text(
             )
             return
         text_from_objects = True
+    add_extents = get_extents(add_bboxes)
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+
+    def repel(extents, rows=None, timings=None):
+        """(delta_x, delta_y, overlaps_x, overlaps_y) by texts, points and objects
+
+        Seconds spent on each are stored in the dict `timings` if given.
+        """
+        no_repulsion = (np.zeros(len(extents)),) * 4
+        result = []
+        for kind, enabled, get_repulsion in [
+            (
+                "text",
+                avoid_text,
+                lambda: repel_extents(expand_extents(extents, expand_text), rows),
+            ),
+            (
+                "points",
+                avoid_points,
+                lambda: repel_extents_from_points(
+                    x, y, expand_extents(extents, expand_points), rows
+                ),
+            ),
+            (
+                "objects",
+                text_from_objects,
+                lambda: repel_extents_from_bboxes(
+                    add_extents, expand_extents(extents, expand_objects), rows
+                ),
+            ),
+        ]:
+            tic = time.perf_counter()
+            result.append(get_repulsion() if enabled else no_repulsion)
+            if timings is not None:
+                timings[kind] = time.perf_counter() - tic
+        return tuple(result)
+
+    def cull_texts(extents):
+        """Hide texts if `cull` is given
+
+        Returns the total overlaps of shown texts, and indices of hidden ones.
+        """
+        shown = np.ones(len(texts), dtype=bool)
+        ranks = (
+            np.array([text.get_fontsize() for text in texts])
+            if priorities is None
+            else np.asarray(priorities)
+        )
+        culled = []
+        if cull is None:
+            overlaps = sum(np.array(q[2:]) for q in repel(extents))
+            return tuple(overlaps.sum(axis=1)), culled
+
+        # Hiding a text only changes overlaps between texts, so overlapping pairs
+        # are found once, and only the overlaps of texts it repelled are updated
+        n = len(texts)
+        _, on_points, on_objects = (np.array(q[2:]) for q in repel(extents))
+        if avoid_text:
+            i, j, overlaps_x, overlaps_y = get_overlapping_pairs(
+                expand_extents(extents, expand_text)
+            )
+        else:
+            i = j = np.empty(0, dtype=np.intp)
+            overlaps_x = overlaps_y = np.empty(0)
+        on_texts = np.array(
+            [np.bincount(i, weights=o, minlength=n) for o in (overlaps_x, overlaps_y)]
+        )
+        # Pairs repelling text k are `rows[k]:rows[k + 1]`, and pairs repelled by
+        # text k are `by_j[cols[k]:cols[k + 1]]`
+        rows = np.searchsorted(i, np.arange(n + 1))
+        by_j = np.argsort(j, kind="stable")
+        cols = np.searchsorted(j[by_j], np.arange(n + 1))
+        while True:
+            overlaps = on_texts + on_points + on_objects
+            totals = overlaps.sum(axis=0)
+            crowded = np.flatnonzero(shown & (totals > cull))
+            if not len(crowded):
+                break
+            # Lowest priority, then largest overlap
+            worst = crowded[np.lexsort((-totals[crowded], ranks[crowded]))[0]]
+            shown[worst] = False
+            texts[worst].set_visible(False)
+            culled.append(int(worst))
+            for k in np.unique(i[by_j[cols[worst] : cols[worst + 1]]]):
+                pairs = slice(rows[k], rows[k + 1])
+                kept = shown[j[pairs]]
+                on_texts[:, k] = (
+                    overlaps_x[pairs][kept].sum(),
+                    overlaps_y[pairs][kept].sum(),
+                )
+        return tuple(overlaps[:, shown].sum(axis=1)), culled
+
+    steps = []
+
+    def render_recorded():
+        """Render recorded steps, without counting the time as adjusting"""
+        nonlocal start
+        rendering = time.perf_counter()
+        render_steps(
+            steps,
+            texts,
+            save_prefix=save_prefix,
+            save_format=save_format,
+            n_jobs=save_jobs,
+        )
+        start += time.perf_counter() - rendering
+
     for text in texts:
         text.set_va(va)
         text.set_ha(ha)
     if save_steps:
-        if add_step_numbers:
-            plt.title("Before")
-        plt.savefig(
-            "%s%s.%s" % (save_prefix, "000a", save_format), format=save_format, dpi=150
+        steps.append(record_step(texts, "000a", "Before" if add_step_numbers else None))
+
+    if engine != "force":
+        if isinstance(engine, str):
+            # Imported here, because `placement` is built on this module
+            from .placement import engines
+
+            engine = engines[engine]
+        extents = get_text_extents(texts, r, ax=ax)
+        new_extents = engine(
+            extents,
+            np.array([get_anchor_position(text, r) for text in texts]),
+            points=np.column_stack([x, y]),
+            add_extents=add_extents,
+            ax_extent=ax.patch.get_extents().extents,
+            expand=expand_text,
+            **({} if occupancy is None else {"occupancy": occupancy}),
         )
+        sync_texts(texts, new_extents, extents, ax=ax)
+        overlap, culled = cull_texts(new_extents)
+        render_recorded()
+        if "arrowprops" in kwargs:
+            add_arrows(
+                texts,
+                kwargs.pop("arrowprops"),
+                ax,
+                r,
+                transform,
+                *args,
+                collection=arrow_collection,
+                **kwargs,
+            )
+        return AdjustResult(
+            n_iter=1,
+            elapsed=time.perf_counter() - start,
+            overlap=overlap,
+            culled=culled,
+        )
+
+    # Texts to adjust from scratch
+    cold = np.ones(len(texts), dtype=bool)
+    if warm_start is not None:
+        freeze_settled = True
+        cold = np.array([w is None for w in warm_start], dtype=bool)
+        starts = [text.get_position() for text in texts]
+        for text, w in zip(texts, warm_start):
+            if w is not None:
+                position, w_ha, w_va = w
+                text.set_position(position)
+                text.set_ha(w_ha)
+                text.set_va(w_va)
+        displaced = ~cold & get_disturbed(
+            get_text_extents(texts, r, expand_text, ax=ax), cold
+        )
+        for i in np.flatnonzero(displaced):
+            texts[i].set_position(starts[i])
+            texts[i].set_ha(ha)
+            texts[i].set_va(va)
+        cold |= displaced
 
     if autoalign:
         if autoalign is True:
             autoalign = "xy"
         for i in range(2):
+            if deadline is not None and time.perf_counter() >= deadline:
+                break
+            tic = time.perf_counter()
             texts = optimally_align_text(
                 x,
                 y,
@@ -661,40 +1483,140 @@ def adjust_text(
                 direction=autoalign,
                 renderer=r,
                 ax=ax,
+                rows=cold,
+                progress=progress,
+                sequential=align_sequentially,
+                deadline=deadline,
             )
+            if callback is not None:
+                callback(
+                    {
+                        "stage": "align",
+                        "pass": i + 1,
+                        "seconds": time.perf_counter() - tic,
+                    }
+                )
 
     if save_steps:
-        if add_step_numbers:
-            plt.title("Autoaligned")
-        plt.savefig(
-            "%s%s.%s" % (save_prefix, "000b", save_format), format=save_format, dpi=150
+        steps.append(
+            record_step(texts, "000b", "Autoaligned" if add_step_numbers else None)
         )
 
     texts = repel_text_from_axes(texts, ax, renderer=r, expand=expand_points)
-    history = [(np.inf, np.inf)] * 10
-    for i in track(range(lim), description="Iterating texts positions"):
-        #        q1, q2 = [np.inf, np.inf], [np.inf, np.inf]
 
-        if avoid_text:
-            d_x_text, d_y_text, q1 = repel_text(
-                texts, renderer=r, ax=ax, expand=expand_text
-            )
-        else:
-            d_x_text, d_y_text, q1 = [0] * len(texts), [0] * len(texts), (0, 0)
-
-        if avoid_points:
-            d_x_points, d_y_points, q2 = repel_text_from_points(
-                x, y, texts, ax=ax, renderer=r, expand=expand_points
+    if levels > 1:
+        # Imported here, because `clusters` is built on this module
+        from .clusters import solve_extents
+
+        extents = get_text_extents(texts, r, ax=ax)
+        coarse = extents
+        for level in range(levels - 1, 0, -1):
+            if deadline is not None and time.perf_counter() >= deadline:
+                break
+            tic = time.perf_counter()
+            scale = 2**level
+            coarse, n_iter = solve_extents(
+                coarse,
+                x,
+                y,
+                add_extents,
+                ax.patch.get_extents().extents,
+                movable=cold,
+                occupancy=occupancy,
+                deadline=deadline,
+                lim=lim,
+                precision=precision * scale,
+                expand_text=expand_text,
+                expand_points=expand_points,
+                expand_objects=expand_objects,
+                force_text=tuple(f * scale for f in force_text),
+                force_points=tuple(f * scale for f in force_points),
+                force_objects=tuple(f * scale for f in force_objects),
+                only_move=only_move,
+                avoid_text=avoid_text,
+                avoid_points=avoid_points,
             )
-        else:
-            d_x_points, d_y_points, q2 = [0] * len(texts), [0] * len(texts), (0, 0)
-
-        if text_from_objects:
-            d_x_objects, d_y_objects, q3 = repel_text_from_bboxes(
-                add_bboxes, texts, ax=ax, renderer=r, expand=expand_objects
+            if callback is not None:
+                callback(
+                    {
+                        "stage": "coarse",
+                        "level": level,
+                        "iterations": n_iter,
+                        "seconds": time.perf_counter() - tic,
+                    }
+                )
+        sync_texts(texts, coarse, extents, ax=ax)
+
+    if n_jobs is not None:
+        # Imported here, because `clusters` is built on this module
+        from .clusters import solve_clusters
+
+        extents = get_text_extents(texts, r, ax=ax)
+        new_extents, n_iter = solve_clusters(
+            extents,
+            x,
+            y,
+            add_extents,
+            ax.patch.get_extents().extents,
+            movable=cold,
+            occupancy=occupancy,
+            deadline=deadline,
+            n_jobs=n_jobs,
+            lim=lim,
+            precision=precision,
+            expand_text=expand_text,
+            expand_points=expand_points,
+            expand_objects=expand_objects,
+            force_text=force_text,
+            force_points=force_points,
+            force_objects=force_objects,
+            only_move=only_move,
+            avoid_text=avoid_text,
+            avoid_points=avoid_points,
+        )
+        sync_texts(texts, new_extents, extents, ax=ax)
+        overlap, culled = cull_texts(new_extents)
+        render_recorded()
+        if "arrowprops" in kwargs:
+            add_arrows(
+                texts,
+                kwargs.pop("arrowprops"),
+                ax,
+                r,
+                transform,
+                *args,
+                collection=arrow_collection,
+                **kwargs,
             )
-        else:
-            d_x_objects, d_y_objects, q3 = [0] * len(texts), [0] * len(texts), (0, 0)
+        return AdjustResult(
+            n_iter=n_iter,
+            elapsed=time.perf_counter() - start,
+            overlap=overlap,
+            culled=culled,
+        )
+    measure_once = measure_once or freeze_settled
+    if measure_once:
+        extents = get_text_extents(texts, r, ax=ax)
+        synced_extents = extents.copy()
+    active = cold.copy()
+    # Overlaps of each text along x and y, as of the last time it was active
+    overlaps = np.zeros((2, len(texts)))
+    if time_budget is not None:
+        best_score, best_extents = np.inf, None
+    history = [(np.inf, np.inf)] * 10
+    for i in maybe_track(range(lim), progress, description="Iterating texts positions"):
+        #        q1, q2 = [np.inf, np.inf], [np.inf, np.inf]
+        tic = time.perf_counter()
+        if not measure_once:
+            extents = get_text_extents(texts, r, ax=ax)
+        timings = {"measure": time.perf_counter() - tic}
+        rows = active if freeze_settled else None
+
+        (
+            (d_x_text, d_y_text, *q1),
+            (d_x_points, d_y_points, *q2),
+            (d_x_objects, d_y_objects, *q3),
+        ) = repel(extents, rows, timings)
 
         if only_move:
             if "text" in only_move:
@@ -723,49 +1645,95 @@ def adjust_text(
             + np.array(d_y_points) * force_points[1]
             + np.array(d_y_objects) * force_objects[1]
         )
-        qx = np.sum([q[0] for q in [q1, q2, q3]])
-        qy = np.sum([q[1] for q in [q1, q2, q3]])
+        if occupancy is not None:
+            d_x_shapes, d_y_shapes = occupancy.get_repulsion(
+                expand_extents(extents, expand_objects)
+            )
+            if rows is not None:
+                d_x_shapes[~rows] = d_y_shapes[~rows] = 0
+            dx += d_x_shapes * force_objects[0]
+            dy += d_y_shapes * force_objects[1]
+        overlaps[:, active] = (np.array(q1) + np.array(q2) + np.array(q3))[:, active]
+        qx, qy = overlaps.sum(axis=1)
         histm = np.max(np.array(history), axis=0)
         history.pop(0)
         history.append((qx, qy))
-        move_texts(texts, dx, dy, bboxes=get_bboxes(texts, r, (1, 1), ax), ax=ax)
+        if time_budget is not None and qx + qy < best_score:
+            best_score, best_extents = qx + qy, extents.copy()
+        if measure_once:
+            dx, dy = move_extents(extents, dx, dy, ax=ax)
+        else:
+            dx, dy = move_texts(texts, dx, dy, bboxes=extents, ax=ax)
+        if callback is not None:
+            callback(
+                {
+                    "stage": "iterate",
+                    "iteration": i + 1,
+                    "elapsed": time.perf_counter() - start,
+                    "seconds": time.perf_counter() - tic,
+                    **timings,
+                    "overlap_x": qx,
+                    "overlap_y": qy,
+                    "active": int(active.sum()),
+                    "max_displacement": float(np.max(np.abs([dx, dy]), initial=0)),
+                }
+            )
+        if freeze_settled:
+            # Settled texts leave the active set, unless a moving text disturbs them
+            moving = active & ((np.abs(dx) > settle_tol) | (np.abs(dy) > settle_tol))
+            active = moving | get_disturbed(
+                expand_extents(extents, expand_text), moving
+            )
         if save_steps:
-            if add_step_numbers:
-                plt.title(i + 1)
-            plt.savefig(
-                "%s%s.%s" % (save_prefix, "{0:03}".format(i + 1), save_format),
-                format=save_format,
-                dpi=150,
+            if measure_once:
+                sync_texts(texts, extents, synced_extents, ax=ax)
+            steps.append(
+                record_step(texts, f"{i + 1:03}", i + 1 if add_step_numbers else None)
             )
         # Stop if we've reached the precision threshold, or if the x and y displacement
         # are both greater than the max over the last 10 iterations (suggesting a
-        # failure to converge)
+        # failure to converge), or if all texts have settled
         if (qx < precision_x and qy < precision_y) or np.all([qx, qy] >= histm):
             break
-        # Now adding arrows from texts to their original locations if required
-    if "arrowprops" in kwargs:
-        bboxes = get_bboxes(texts, r, (1, 1), ax)
-        kwap = kwargs.pop("arrowprops")
-        for j, (bbox, text) in enumerate(zip(bboxes, texts)):
-            ap = {"patchA": text}  # Ensure arrow is clipped by the text
-            ap.update(kwap)  # Add arrowprops from kwargs
-            ax.annotate(
-                "",  # Add an arrow from the text to the point
-                xy=text.xy,
-                xytext=transform.inverted().transform(get_midpoint(bbox)),
-                arrowprops=ap,
-                textcoords=transform,
-                *args,
-                **kwargs,
-            )
+        if not active.any():
+            break
+        if deadline is not None and time.perf_counter() >= deadline:
+            break
 
-    if save_steps:
-        if add_step_numbers:
-            plt.title(i + 1)
-            plt.savefig(
-                "%s%s.%s" % (save_prefix, "{0:03}".format(i + 1), save_format),
-                format=save_format,
-                dpi=150,
-            )
+    if not measure_once:
+        extents = get_text_extents(texts, r, ax=ax)
+    overlap = tuple(sum(np.array(q[2:]) for q in repel(extents)).sum(axis=1))
+    if time_budget is not None and best_score < sum(overlap):
+        # Roll back to the best layout
+        if measure_once:
+            extents[:] = best_extents
+        else:
+            sync_texts(texts, best_extents, extents, ax=ax)
+    if measure_once:
+        sync_texts(texts, extents, synced_extents, ax=ax)
+    overlap, culled = cull_texts(extents)
+    render_recorded()
+    # Now adding arrows from texts to their original locations if required
+    if "arrowprops" in kwargs:
+        add_arrows(
+            texts,
+            kwargs.pop("arrowprops"),
+            ax,
+            r,
+            transform,
+            *args,
+            collection=arrow_collection,
+            **kwargs,
+        )
 
-    return i + 1
+    if save_steps and add_step_numbers and save_format not in animation_writers:
+        # The final layout, with arrows, after the recorded iterations
+        steps[:] = [record_step(texts, "final", i + 1)]
+        render_recorded()
+
+    return AdjustResult(
+        n_iter=i + 1,
+        elapsed=time.perf_counter() - start,
+        overlap=overlap,
+        culled=culled,
+    )
@@ -8,7 +8,13 @@ if TYPE_CHECKING:
     from matplotlib.text import Annotation
 
 
-def amend(texts: list[Annotation]) -> None:
+def amend(texts: list[Annotation], missing_ok=False) -> None:
+    """Move some texts by hand
+
+    Texts that are not found are skipped if `missing_ok`, e.g. when data are
+    filtered.
+    """
+
     translations = [
         ("越中览古", (0, -20)),
         ("The Sound of Music (film)", (-100, 0)),
@@ -28,13 +34,16 @@ def amend(texts: list[Annotation]) -> None:
     ]
 
     for n, t in translations:
-        _set_offset(_find(texts, n), t)
+        if (text := _find(texts, n)) is not None:
+            _set_offset(text, t)
+        else:
+            assert missing_ok, f"Text not found: “{n}”"
 
 
-def _find(texts: list[Annotation], name) -> Annotation:
+def _find(texts: list[Annotation], name) -> Annotation | None:
     candidates = [t for t in texts if t.get_text() == name]
-    assert len(candidates) == 1
-    return candidates[0]
+    assert len(candidates) <= 1
+    return candidates[0] if candidates else None
 
 
 def _set_offset(text: Annotation, offset: tuple[float, float]) -> None:
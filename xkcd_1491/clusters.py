@@ -0,0 +1,279 @@
+"""Parallel adjustment of independent clusters of texts
+
+Texts only repel texts they overlap, so texts in different connected components
+of the overlap graph can be adjusted independently, in a process pool.
+
+Components are adjusted on arrays of extents, in display coordinates, without
+the texts themselves. Small components are batched, so that each job is worth
+the overhead of a process. When adjusted components grow into each other, they
+are merged and adjusted again.
+"""
+
+from __future__ import annotations
+
+import time
+
+import numpy as np
+
+from .adjust_text import (
+    expand_extents,
+    get_candidate_pairs,
+    repel_extents,
+    repel_extents_from_bboxes,
+    repel_extents_from_points,
+)
+from .pool import process_pool
+
+
+def get_components(extents):
+    """Return the connected component of each box in the overlap graph
+
+    Components are numbered 0, 1, … in order of their first boxes.
+    """
+    i, j = get_candidate_pairs(extents)
+    x0, y0, x1, y1 = extents.T
+    overlap = (np.minimum(x1[i], x1[j]) >= np.maximum(x0[i], x0[j])) & (
+        np.minimum(y1[i], y1[j]) >= np.maximum(y0[i], y0[j])
+    )
+    i, j = i[overlap], j[overlap]
+    i, j = np.concatenate([i, j]), np.concatenate([j, i])
+
+    # Propagate the least index in each component, with pointer jumping
+    labels = np.arange(len(extents))
+    while True:
+        new_labels = labels.copy()
+        np.minimum.at(new_labels, i, labels[j])
+        new_labels = new_labels[new_labels]
+        if np.array_equal(new_labels, labels):
+            break
+        labels = new_labels
+    return np.unique(labels, return_inverse=True)[1]
+
+
+def group_components(components, batch_size=16):
+    """Split boxes into groups of whole components
+
+    A component with at least `batch_size` boxes forms a group of its own, and
+    smaller ones are batched until they reach `batch_size`.
+
+    Returns a list of index arrays, largest first.
+    """
+    sizes = np.bincount(components)
+    groups = []
+    batch = []
+    for c in np.argsort(-sizes, kind="stable"):
+        indices = np.flatnonzero(components == c)
+        if sizes[c] >= batch_size:
+            groups.append(indices)
+            continue
+        batch.append(indices)
+        if sum(map(len, batch)) >= batch_size:
+            groups.append(np.concatenate(batch))
+            batch = []
+    if batch:
+        groups.append(np.concatenate(batch))
+    return groups
+
+
+def solve_extents(
+    extents,
+    x,
+    y,
+    add_extents,
+    ax_extent,
+    *,
+    movable=None,
+    occupancy=None,
+    deadline=None,
+    lim=500,
+    precision=0.01,
+    expand_text=(1.05, 1.2),
+    expand_points=(1.05, 1.2),
+    expand_objects=(1.05, 1.2),
+    force_text=(0.1, 0.25),
+    force_points=(0.2, 0.5),
+    force_objects=(0.1, 0.25),
+    only_move={"points": "xy", "text": "xy", "objects": "xy"},
+    avoid_text=True,
+    avoid_points=True,
+):
+    """Repel (N, 4) extents of texts from each other, points and objects
+
+    The same iteration as `adjust_text`, on arrays only. Parameters are as in
+    `adjust_text`, except that `x`, `y` and `add_extents` are in display
+    coordinates, and `ax_extent` is (xmin, ymin, xmax, ymax) of the axes.
+    If `movable` is given, only texts in this boolean mask move, and the others
+    are obstacles. If `occupancy` is given, texts are pushed off its occupied
+    cells with `force_objects`, as in `adjust_text`. If `deadline` (in
+    `time.perf_counter()`) is given, iterations stop once it has passed.
+
+    Returns the new extents and the number of iterations.
+    """
+    extents = extents.copy()
+    sum_width, sum_height = np.sum(extents[:, 2:] - extents[:, :2], axis=0)
+    moves = "".join(only_move.values())
+    precision_x = precision * sum_width if "x" in moves else np.inf
+    precision_y = precision * sum_height if "y" in moves else np.inf
+
+    history = [(np.inf, np.inf)] * 10
+    for i in range(lim):
+        repulsions = []
+        if avoid_text:
+            repulsions.append(
+                (
+                    "text",
+                    force_text,
+                    repel_extents(expand_extents(extents, expand_text), movable),
+                )
+            )
+        if avoid_points:
+            repulsions.append(
+                (
+                    "points",
+                    force_points,
+                    repel_extents_from_points(
+                        x, y, expand_extents(extents, expand_points), movable
+                    ),
+                )
+            )
+        if len(add_extents):
+            repulsions.append(
+                (
+                    "objects",
+                    force_objects,
+                    repel_extents_from_bboxes(
+                        add_extents, expand_extents(extents, expand_objects), movable
+                    ),
+                )
+            )
+
+        dx = np.zeros(len(extents))
+        dy = np.zeros(len(extents))
+        qx = qy = 0
+        for kind, force, (d_x, d_y, q_x, q_y) in repulsions:
+            if "x" in only_move.get(kind, "xy"):
+                dx += d_x * force[0]
+            if "y" in only_move.get(kind, "xy"):
+                dy += d_y * force[1]
+            qx += np.sum(q_x)
+            qy += np.sum(q_y)
+        if occupancy is not None:
+            d_x, d_y = occupancy.get_repulsion(expand_extents(extents, expand_objects))
+            if movable is not None:
+                d_x[~movable] = d_y[~movable] = 0
+            dx += d_x * force_objects[0]
+            dy += d_y * force_objects[1]
+        histm = np.max(np.array(history), axis=0)
+        history.pop(0)
+        history.append((qx, qy))
+
+        # Keep texts inside the axes, like `move_extents`
+        x0, y0, x1, y1 = extents.T
+        dx = np.where((x0 + dx < ax_extent[0]) | (x1 + dx > ax_extent[2]), 0, dx)
+        dy = np.where((y0 + dy < ax_extent[1]) | (y1 + dy > ax_extent[3]), 0, dy)
+        extents[:, [0, 2]] += dx[:, np.newaxis]
+        extents[:, [1, 3]] += dy[:, np.newaxis]
+
+        if (qx < precision_x and qy < precision_y) or np.all([qx, qy] >= histm):
+            break
+        if deadline is not None and time.perf_counter() >= deadline:
+            break
+    return extents, i + 1
+
+
+def solve_clusters(
+    extents,
+    x,
+    y,
+    add_extents,
+    ax_extent,
+    *,
+    movable=None,
+    n_jobs=None,
+    batch_size=16,
+    max_rounds=3,
+    **options,
+):
+    """Solve independent clusters of texts in parallel
+
+    Clusters are connected components of texts overlapping each other, with
+    bboxes expanded by `options["expand_text"]`. After solving, components
+    spanning several groups are merged and solved again, at most `max_rounds`
+    times in total, and not after `options["deadline"]`.
+
+    Parameters
+    ----------
+    movable : (N,) bool array, optional
+        Texts that may move, see `solve_extents`.
+    n_jobs : int, optional
+        Number of processes. The default is the number of CPUs. See `pool` for
+        how they are started.
+    batch_size : int, default 16
+        See `group_components`.
+    options :
+        Passed to `solve_extents`.
+
+    Returns the new extents and the number of iterations of the longest job.
+    """
+    expand = options.get("expand_text", (1.05, 1.2))
+    extents = extents.copy()
+    groups = group_components(
+        get_components(expand_extents(extents, expand)), batch_size
+    )
+    args = (x, y, add_extents, ax_extent)
+    n_iter = 0
+    deadline = options.get("deadline")
+    if deadline is not None and time.perf_counter() >= deadline:
+        # Not even worth starting processes
+        return extents, n_iter
+
+    with process_pool(n_jobs) as pool:
+        for _ in range(max_rounds):
+            if len(groups) == 1:
+                # Not worth another process
+                g = groups[0]
+                results = [
+                    solve_extents(
+                        extents[g], *args, movable=_take(movable, g), **options
+                    )
+                ]
+            else:
+                futures = [
+                    pool.submit(
+                        solve_extents,
+                        extents[g],
+                        *args,
+                        movable=_take(movable, g),
+                        **options,
+                    )
+                    for g in groups
+                ]
+                results = [f.result() for f in futures]
+
+            group_of = np.full(len(extents), -1)
+            for g, (indices, (new_extents, it)) in enumerate(zip(groups, results)):
+                extents[indices] = new_extents
+                group_of[indices] = g
+                n_iter = max(n_iter, it)
+
+            # Re-merge components that have grown into each other, or into texts
+            # not solved in this round
+            components = get_components(expand_extents(extents, expand))
+            spanning = [
+                c
+                for c in np.unique(components)
+                if len(np.unique(group_of[components == c])) > 1
+            ]
+            if not spanning:
+                break
+            if deadline is not None and time.perf_counter() >= deadline:
+                break
+            indices = np.flatnonzero(np.isin(components, spanning))
+            merged = np.unique(components[indices], return_inverse=True)[1]
+            groups = [indices[g] for g in group_components(merged, batch_size)]
+
+    return extents, n_iter
+
+
+def _take(mask, indices):
+    return None if mask is None else mask[indices]
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from collections import deque
 from dataclasses import dataclass
 from itertools import chain
 from typing import TYPE_CHECKING
@@ -7,11 +8,16 @@ from typing import TYPE_CHECKING
 import polars as pl
 from ruamel.yaml import YAML
 
+from ..pool import process_pool
+from .compiled import load_compiled
+from .query import DataFilter as DataFilter
+from .table import EventTable as EventTable
 from .util import average, diff, tuple_or_int
 
 if TYPE_CHECKING:
+    from concurrent.futures import Future
     from pathlib import Path
-    from typing import Iterable
+    from typing import Iterable, Iterator
 
 
 @dataclass
@@ -44,29 +50,158 @@ class Publication:
     series: list[Event]
 
 
-def _load_events(file: Path) -> list[Publication]:
-    events = pl.scan_csv(
+def _iter_events(
+    file: Path, where: DataFilter | None = None, batch_size: int = 10_000
+) -> Iterator[Publication]:
+    """Read events in batches of rows
+
+    Only about `batch_size` rows are parsed and converted to Python objects at a
+    time. Rows rejected by `where` are filtered in each batch.
+    """
+    columns = ["publication", "author", "written_in", "set_in"]
+    reader = pl.read_csv_batched(
         file,
+        columns=columns,
         dtypes={
             "publication": pl.Utf8,
             "author": pl.Utf8,
             "written_in": pl.Int64,
             "set_in": pl.Int64,
         },
-    ).select(["publication", "author", "written_in", "set_in"])
+        batch_size=batch_size,
+    )
+    expr = None if where is None else where.scan_expr()
 
-    return [
-        Publication(
-            name=e[0],
-            author=e[1],
-            series=[Event(name=None, written_in=e[2], set_in=e[3])],
+    while batches := reader.next_batches(1):
+        for batch in batches:
+            batch = batch.select(columns)
+            if expr is not None:
+                batch = batch.filter(expr)
+            for e in batch.rows():
+                yield Publication(
+                    name=e[0],
+                    author=e[1],
+                    series=[Event(name=None, written_in=e[2], set_in=e[3])],
+                )
+
+
+# Columns of tables, and whether they are required
+_table_columns = {
+    "publication": True,
+    "author": False,
+    "name": False,
+    "written_in": True,
+    "set_in": True,
+}
+# Columnar formats are read without parsing, so they are not compiled
+_columnar_suffixes = {".parquet", ".arrow", ".feather", ".ipc"}
+
+
+def _year_or_range(value: int | list[int]) -> int | tuple[int, int]:
+    """Convert a cell of a table, where lists of one year are years"""
+    if not isinstance(value, list):
+        return value
+    if len(value) == 1:
+        return value[0]
+    if len(value) != 2:
+        raise ValueError(f"A range should have 2 years rather than {len(value)}")
+    return tuple(value)
+
+
+def _iter_table(
+    frame: pl.LazyFrame, where: DataFilter | None = None, batch_size: int = 10_000
+) -> Iterator[Publication]:
+    """Read events from a table
+
+    Each row is an event. Consecutive rows of the same publication and author
+    form its series. `written_in` and `set_in` are integers, or lists of integers
+    for ranges, where lists of one integer are years. `author` and `name` are
+    optional.
+
+    Alternatively, each row is a publication, with its events in a `series`
+    column of lists of structs, whose fields are as above.
+
+    Only these columns are read. Polars 0.16 cannot read Parquet or IPC files in
+    batches, so they are collected at once (IPC files stay memory-mapped), and
+    only converted to Python objects in batches of rows, column by column.
+    Rows of publications rejected by `where` are filtered in the scan, and series
+    out of its ranges are dropped after reading.
+    """
+    schema = frame.schema
+    expr = None if where is None else where.scan_expr(events=False)
+    if nested := "series" in schema:
+        frame = frame.select(
+            [c for c in ("publication", "author") if c in schema] + ["series"]
         )
-        for e in events.collect().rows()
-    ]
+        if expr is not None:
+            frame = frame.filter(expr)
+        # Flatten series, and tell publications apart by their rows
+        frame = (
+            frame.with_row_count("_publication")
+            .explode("series")
+            .unnest("series")
+            .filter(pl.col("written_in").is_not_null())
+        )
+        schema = frame.schema
+        expr = None
+    if missing := [c for c, req in _table_columns.items() if req and c not in schema]:
+        raise ValueError(f"Missing columns: {', '.join(missing)}")
+    frame = frame.select(
+        [c for c in _table_columns if c in schema]
+        + (["_publication"] if nested else [])
+    )
+    if expr is not None:
+        frame = frame.filter(expr)
+    events = frame.collect()
 
+    publication = None
+    previous = None
+    for batch in events.iter_slices(n_rows=batch_size):
+        columns = [
+            batch.get_column(c).to_list() if c in schema else [None] * batch.height
+            for c in _table_columns
+        ]
+        groups = (
+            batch.get_column("_publication").to_list()
+            if nested
+            else zip(columns[0], columns[1])
+        )
+        for group, (name, author, event_name, written_in, set_in) in zip(
+            groups, zip(*columns)
+        ):
+            if publication is None or group != previous:
+                if publication is not None and (
+                    where is None or where.accepts(publication)
+                ):
+                    yield publication
+                publication = Publication(name=name, author=author, series=[])
+                previous = group
+            publication.series.append(
+                Event(
+                    name=event_name,
+                    written_in=_year_or_range(written_in),
+                    set_in=_year_or_range(set_in),
+                )
+            )
+    if publication is not None and (where is None or where.accepts(publication)):
+        yield publication
 
-def _load_series(file: Path) -> list[Publication]:
+
+def _load_series(file: Path, where: DataFilter | None = None) -> list[Publication]:
     publications = YAML(typ="safe").load(file.read_text(encoding="utf-8"))
+    if where is not None:
+        # Reject before building events
+        publications = [
+            p
+            for p in publications
+            if where.accepts_publication(p["publication"], p.get("author"))
+            and any(
+                where.accepts_event(
+                    tuple_or_int(e["written_in"]), tuple_or_int(e["set_in"])
+                )
+                for e in p["series"]
+            )
+        ]
 
     return [
         Publication(
@@ -85,24 +220,102 @@ def _load_series(file: Path) -> list[Publication]:
     ]
 
 
-def _load_data(file: Path) -> list[Publication]:
-    """Load a set of data"""
+def _iter_data(file: Path, where: DataFilter | None = None) -> Iterator[Publication]:
+    """Load a set of data, yielding publications as they are read"""
 
     match file.suffix:
         case ".yaml" | ".yml":
-            return _load_series(file)
+            yield from _load_series(file, where)
         case ".csv":
-            return _load_events(file)
+            yield from _iter_events(file, where)
+        case ".parquet":
+            yield from _iter_table(pl.scan_parquet(file), where)
+        case ".arrow" | ".feather" | ".ipc":
+            yield from _iter_table(pl.scan_ipc(file, memory_map=True), where)
         case _:
             raise ValueError(f"Unknown data format: “{file}”")
 
 
-def load_data(files: Iterable[Path]) -> Iterable[Publication]:
+def _load_data(file: Path, where: DataFilter | None = None) -> list[Publication]:
+    """Load a set of data"""
+
+    return list(_iter_data(file, where))
+
+
+def _load_file(
+    file: Path, cache_dir: Path | None, where: DataFilter | None = None
+) -> Iterable[Publication]:
+    """Load a set of data, via the compiled cache if `cache_dir` is given
+
+    Publications are yielded as they are read, unless they are compiled. The
+    compiled cache keeps all publications in an `EventTable`, which is filtered by
+    `where` as columns, and yields views of the rest.
+    """
+
+    if cache_dir is None or file.suffix in _columnar_suffixes:
+        return _iter_data(file, where)
+
+    table = load_compiled(file, cache_dir, _load_data)
+    if where is not None:
+        table = table.select(where.accepts_table(table))
+    return table.publications()
+
+
+def load_data(
+    files: Iterable[Path],
+    cache_dir: Path | None = None,
+    n_jobs: int | None = None,
+    max_pending: int | None = None,
+    where: DataFilter | None = None,
+) -> Iterable[Publication]:
     """Load data from files
 
     Data format:
         - csv: events.
         - yaml: series.
+        - parquet, arrow, feather or ipc: events grouped into series, or
+          publications with nested series.
+          Only the needed columns are read, and Arrow IPC files are memory-mapped.
+
+    If `cache_dir` is given, parsed files are compiled there, and reused by later
+    calls until the files change. Their publications are then loaded as views of
+    an `EventTable`, with the same attributes. See `compiled`.
+
+    If `n_jobs` is more than 1, files are parsed in that many processes (see
+    `pool`), and publications are yielded as soon as their files and all previous
+    files are parsed, in the same order as loading serially. At most `max_pending`
+    files (default `2 * n_jobs`) are parsed or waiting ahead of the consumer.
+
+    If `where` is given, only publications it accepts are loaded, see
+    `DataFilter`.
     """
 
-    return chain.from_iterable(map(_load_data, files))
+    if n_jobs is None or n_jobs <= 1:
+        return chain.from_iterable(_load_file(file, cache_dir, where) for file in files)
+
+    return _load_parallel(files, cache_dir, n_jobs, max_pending or 2 * n_jobs, where)
+
+
+def _read_file(
+    file: Path, cache_dir: Path | None, where: DataFilter | None
+) -> list[Publication]:
+    """`_load_file` in a worker process, which can only return whole lists"""
+
+    return list(_load_file(file, cache_dir, where))
+
+
+def _load_parallel(
+    files: Iterable[Path],
+    cache_dir: Path | None,
+    n_jobs: int,
+    max_pending: int,
+    where: DataFilter | None,
+) -> Iterator[Publication]:
+    with process_pool(n_jobs) as pool:
+        pending: deque[Future[list[Publication]]] = deque()
+        for file in files:
+            if len(pending) >= max_pending:
+                yield from pending.popleft().result()
+            pending.append(pool.submit(_read_file, file, cache_dir, where))
+        while pending:
+            yield from pending.popleft().result()
@@ -0,0 +1,153 @@
+"""Compiled cache of parsed data files
+
+Parsing YAML is slow, so each data file is compiled into a `.npz` file of plain
+arrays, and strings are joined into a single UTF-8 table.
+
+A compiled file is reused if the source's size and mtime are unchanged, or else
+if its content hash is unchanged.
+"""
+
+from __future__ import annotations
+
+from hashlib import sha256
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from .table import EventTable
+
+if TYPE_CHECKING:
+    from pathlib import Path
+    from typing import Callable
+
+    from . import Publication
+
+# Bump when the layout of arrays changes
+VERSION = 1
+
+
+def _encode_values(values: list[int | tuple[int, ...]]) -> dict[str, np.ndarray]:
+    """Flatten scalars and tuples
+
+    `shapes` are numbers of values in tuples, or 0 for scalars.
+    """
+    shapes = [len(v) if isinstance(v, tuple) else 0 for v in values]
+    flat = [x for v in values for x in (v if isinstance(v, tuple) else (v,))]
+    return {
+        "values": np.array(flat, dtype=np.int64),
+        "shapes": np.array(shapes, dtype=np.int64),
+    }
+
+
+def _decode_years(values: np.ndarray, shapes: np.ndarray) -> tuple[np.ndarray, ...]:
+    """Columns of `EventTable` from `_encode_values`
+
+    Returns min, max, whether ranges, average and diff of years.
+    """
+    counts = np.maximum(shapes, 1)
+    if not len(counts):
+        return (values, values, shapes > 0, values.astype(float), values)
+    starts = np.cumsum(counts) - counts
+    low = np.minimum.reduceat(values, starts)
+    high = np.maximum.reduceat(values, starts)
+    ranges = shapes > 0
+    return (
+        low,
+        high,
+        ranges,
+        np.add.reduceat(values, starts) / counts,
+        np.where(ranges, high - low, 1),
+    )
+
+
+def compile_publications(publications: list[Publication]) -> dict[str, np.ndarray]:
+    """Convert publications to arrays"""
+    strings: dict[str, int] = {}
+
+    def intern(s: str | None) -> int:
+        return -1 if s is None else strings.setdefault(s, len(strings))
+
+    events = [e for p in publications for e in p.series]
+    arrays = {
+        "publication_name": [intern(p.name) for p in publications],
+        "publication_author": [intern(p.author) for p in publications],
+        "publication_size": [len(p.series) for p in publications],
+        "event_name": [intern(e.name) for e in events],
+    }
+    arrays = {k: np.array(v, dtype=np.int64) for k, v in arrays.items()}
+    for field in ["written_in", "set_in"]:
+        for k, v in _encode_values([getattr(e, field) for e in events]).items():
+            arrays[f"{field}_{k}"] = v
+    arrays["strings"] = np.frombuffer(
+        "\0".join(strings).encode("utf-8"), dtype=np.uint8
+    )
+    return arrays
+
+
+def decompile_table(arrays) -> EventTable:
+    """Build an `EventTable` from the arrays of `compile_publications`"""
+    table = arrays["strings"].tobytes().decode("utf-8").split("\0")
+    columns = {
+        "publication_name": arrays["publication_name"],
+        "publication_author": arrays["publication_author"],
+        "name": arrays["event_name"],
+    }
+    for field in ["written_in", "set_in"]:
+        for column, values in zip(
+            ["min", "max", "range", "average", "diff"],
+            _decode_years(arrays[f"{field}_values"], arrays[f"{field}_shapes"]),
+        ):
+            columns[f"{field}_{column}"] = values
+    # Index -1 is None
+    return EventTable([*table, None], arrays["publication_size"], **columns)
+
+
+def load_compiled(
+    file: Path, directory: Path, parse: Callable[[Path], list[Publication]]
+) -> EventTable:
+    """Load a data file as a table via its compiled cache in `directory`
+
+    `parse` is called to load the file if it has not been compiled, or has
+    changed since. Otherwise, the table is built from the compiled arrays,
+    without creating objects per publication or event.
+    """
+    stat = file.stat()
+    compiled = (
+        directory / f"{sha256(str(file.resolve()).encode('utf-8')).hexdigest()}.npz"
+    )
+
+    content_hash = None
+    if compiled.exists():
+        with np.load(compiled) as arrays:
+            version, size, mtime = arrays["meta"].tolist()
+            if version == VERSION:
+                if (size, mtime) == (stat.st_size, stat.st_mtime_ns):
+                    return decompile_table(arrays)
+                content_hash = sha256(file.read_bytes()).digest()
+                if arrays["content_hash"].tobytes() == content_hash:
+                    # Only touched, so record the new stat
+                    table = decompile_table(arrays)
+                    _save(compiled, arrays, stat)
+                    return table
+
+    publications = parse(file)
+    if content_hash is None:
+        content_hash = sha256(file.read_bytes()).digest()
+    arrays = compile_publications(publications)
+    arrays["content_hash"] = np.frombuffer(content_hash, dtype=np.uint8)
+    directory.mkdir(parents=True, exist_ok=True)
+    _save(compiled, arrays, stat)
+    return decompile_table(arrays)
+
+
+def _save(compiled: Path, arrays, stat) -> None:
+    """Save arrays with the stat of the source file
+
+    Written to a temporary file first, so that concurrent readers never see
+    a partial file.
+    """
+    arrays = {k: arrays[k] for k in arrays if k != "meta"}
+    arrays["meta"] = np.array([VERSION, stat.st_size, stat.st_mtime_ns])
+    partial = compiled.with_suffix(".tmp.npz")
+    np.savez(partial, **arrays)
+    partial.replace(compiled)
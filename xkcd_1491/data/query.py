@@ -0,0 +1,119 @@
+"""Filters applied while loading data
+
+Publications that can never appear in a chart should be neither loaded nor
+drawn, so filters are pushed into Polars' lazy scans or applied to columns of
+`EventTable` where possible, and otherwise checked before building events.
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from functools import reduce
+from operator import and_
+from typing import TYPE_CHECKING
+
+import numpy as np
+import polars as pl
+
+from .util import average
+
+if TYPE_CHECKING:
+    from . import Publication
+    from .table import EventTable
+
+
+@dataclass(frozen=True)
+class DataFilter:
+    """Which publications to load
+
+    A publication is kept if it matches `author` and `name`, and any of its
+    events is within `written_in` and `set_in_delta`. These bound x and y of
+    events, as in `util.event_to_xy`, and None means unbounded. A series is kept
+    as a whole, so that its line can still be drawn.
+    """
+
+    written_in: tuple[float | None, float | None] = (None, None)
+    set_in_delta: tuple[float | None, float | None] = (None, None)
+    author: str | None = None
+    name: str | None = None
+    """Regular expression searched in the publication's name
+
+    It is matched by Polars for tables, so stick to syntax shared with `re`.
+    """
+
+    def accepts_publication(self, name: str, author: str | None) -> bool:
+        """Check the attributes of a publication"""
+        if self.author is not None and author != self.author:
+            return False
+        return self.name is None or re.search(self.name, name) is not None
+
+    def accepts_event(
+        self, written_in: int | tuple[int, ...], set_in: int | tuple[int, ...]
+    ) -> bool:
+        """Check the position of an event"""
+        x = average(written_in)
+        return _within(x, self.written_in) and _within(
+            average(set_in) - x, self.set_in_delta
+        )
+
+    def accepts(self, publication: Publication) -> bool:
+        return self.accepts_publication(publication.name, publication.author) and any(
+            self.accepts_event(e.written_in, e.set_in) for e in publication.series
+        )
+
+    def accepts_table(self, table: EventTable) -> np.ndarray:
+        """Mask of accepted publications in a table
+
+        Strings are checked once each, and events as columns, so no publication
+        or event is built.
+        """
+        accepted = np.ones(len(table.publication_name), dtype=bool)
+        if self.author is not None:
+            authors = np.array([s == self.author for s in table.strings])
+            accepted &= authors[table.publication_author]
+        if self.name is not None:
+            names = np.array(
+                [
+                    s is not None and re.search(self.name, s) is not None
+                    for s in table.strings
+                ]
+            )
+            accepted &= names[table.publication_name]
+        x = table.written_in_average
+        events = (
+            np.ones(len(x), dtype=bool)
+            & _within(x, self.written_in)
+            & _within(table.set_in_average - x, self.set_in_delta)
+        )
+        return accepted & (
+            np.bincount(table.publication[events], minlength=len(accepted)) > 0
+        )
+
+    def scan_expr(self, events: bool = True) -> pl.Expr | None:
+        """Predicate for rows of a table, or None if all rows pass
+
+        If `events`, each row is an event of its own publication, with integer
+        `written_in` and `set_in`, as in CSV files. Otherwise, rows are parts of
+        series, and only `author` and `publication` are checked.
+        """
+        conditions = []
+        if self.author is not None:
+            conditions.append(pl.col("author") == self.author)
+        if self.name is not None:
+            conditions.append(pl.col("publication").str.contains(self.name))
+        if events:
+            x = pl.col("written_in")
+            y = pl.col("set_in") - pl.col("written_in")
+            for value, (low, high) in [(x, self.written_in), (y, self.set_in_delta)]:
+                if low is not None:
+                    conditions.append(value >= low)
+                if high is not None:
+                    conditions.append(value <= high)
+        return reduce(and_, conditions) if conditions else None
+
+
+def _within(value, bounds: tuple[float | None, float | None]):
+    """Whether a value, or each of an array, is within bounds"""
+    low, high = bounds
+    return (low is None or value >= low) & (high is None or value <= high)
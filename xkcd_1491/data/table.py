@@ -0,0 +1,230 @@
+"""Columnar storage of events
+
+`Event` and `Publication` are convenient for loading, but each event is a few
+Python objects, and its averages and diffs are recomputed on every access.
+`EventTable` keeps events as NumPy columns instead, with precomputed averages
+and diffs, for code that works on all events at once, e.g. `EventTable.xy` and
+filters.
+
+Views provide the attributes of `Event` and `Publication` on top of columns, for
+code that has not been vectorized, e.g. drawing. They are about as fast as the
+dataclasses, and only created when accessed.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from .util import average, diff
+
+if TYPE_CHECKING:
+    from typing import Iterable
+
+    from . import Publication
+
+
+# Columns of publications and of events, see `EventTable`
+_publication_columns = ("publication_name", "publication_author")
+_event_columns = (
+    "name",
+    *(
+        f"{field}_{column}"
+        for field in ("written_in", "set_in")
+        for column in ("min", "max", "range", "average", "diff")
+    ),
+)
+
+
+class EventTable:
+    """Events of publications, as columns
+
+    Each event has `written_in` and `set_in` as `*_min`, `*_max` and `*_range`
+    (whether it is a range rather than a year), with precomputed `*_average` and
+    `*_diff`. Ranges are kept by their bounds only.
+
+    Strings are interned in `strings`, and referred to by indices, where -1
+    means None, so `strings` ends with None.
+
+    Tables are built from columns, e.g. by `compiled.decompile_table`, or from
+    publications by `from_publications`.
+    """
+
+    def __init__(self, strings: list[str | None], sizes: np.ndarray, **columns):
+        """
+        Parameters:
+            - `strings`
+            - `sizes`: numbers of events of publications.
+            - `columns`: arrays named as attributes, e.g. `publication_name`.
+        """
+        self.strings = strings
+        for column in (*_publication_columns, *_event_columns):
+            setattr(self, column, columns[column])
+        # Events of the i-th publication are `starts[i]:starts[i + 1]`
+        self.starts = np.concatenate([[0], np.cumsum(sizes, dtype=np.intp)])
+        self.publication = np.repeat(np.arange(len(sizes), dtype=np.int32), sizes)
+
+    @classmethod
+    def from_publications(cls, publications: Iterable[Publication]) -> EventTable:
+        publications = list(publications)
+        events = [e for p in publications for e in p.series]
+        strings: list[str | None] = []
+        index: dict[str, int] = {}
+
+        def intern(s: str | None) -> int:
+            if s is None:
+                return -1
+            if s not in index:
+                index[s] = len(strings)
+                strings.append(s)
+            return index[s]
+
+        columns = {
+            "publication_name": [intern(p.name) for p in publications],
+            "publication_author": [intern(p.author) for p in publications],
+            "name": [intern(e.name) for e in events],
+        }
+        columns = {k: np.array(v, dtype=np.int32) for k, v in columns.items()}
+        strings.append(None)  # Index -1
+        for field in ("written_in", "set_in"):
+            for column, values in zip(
+                ("min", "max", "range", "average", "diff"),
+                _year_columns([getattr(e, field) for e in events]),
+            ):
+                columns[f"{field}_{column}"] = values
+        return cls(strings, np.array([len(p.series) for p in publications]), **columns)
+
+    def select(self, publications: np.ndarray) -> EventTable:
+        """Table of the publications in a boolean mask, with all their events"""
+        events = publications[self.publication]
+        return EventTable(
+            self.strings,
+            np.diff(self.starts)[publications],
+            **{c: getattr(self, c)[publications] for c in _publication_columns},
+            **{c: getattr(self, c)[events] for c in _event_columns},
+        )
+
+    def __len__(self) -> int:
+        return len(self.name)
+
+    def __getitem__(self, i: int) -> EventView:
+        return EventView(self, i)
+
+    @property
+    def xy(self) -> np.ndarray:
+        """(N, 2) positions of events, see `util.event_to_xy`"""
+        return np.column_stack(
+            [self.written_in_average, self.set_in_average - self.written_in_average]
+        )
+
+    def publications(self) -> list[PublicationView]:
+        """Views of publications"""
+        return [PublicationView(self, i) for i in range(len(self.publication_name))]
+
+
+class EventView:
+    """An event in an `EventTable`, with the attributes of `Event`"""
+
+    __slots__ = ("table", "index")
+
+    def __init__(self, table: EventTable, index: int) -> None:
+        self.table = table
+        self.index = index
+
+    @property
+    def name(self) -> str | None:
+        return self.table.strings[self.table.name[self.index]]
+
+    @property
+    def written_in(self) -> int | tuple[int, int]:
+        t, i = self.table, self.index
+        if t.written_in_range[i]:
+            return int(t.written_in_min[i]), int(t.written_in_max[i])
+        return int(t.written_in_min[i])
+
+    @property
+    def set_in(self) -> int | tuple[int, int]:
+        t, i = self.table, self.index
+        if t.set_in_range[i]:
+            return int(t.set_in_min[i]), int(t.set_in_max[i])
+        return int(t.set_in_min[i])
+
+    # Years stay `int`, as in `Event`, so that positions of texts are the same
+
+    @property
+    def written_in_average(self) -> float | int:
+        t, i = self.table, self.index
+        if t.written_in_range[i]:
+            return float(t.written_in_average[i])
+        return int(t.written_in_min[i])
+
+    @property
+    def written_in_diff(self) -> int:
+        return int(self.table.written_in_diff[self.index])
+
+    @property
+    def set_in_average(self) -> float | int:
+        t, i = self.table, self.index
+        if t.set_in_range[i]:
+            return float(t.set_in_average[i])
+        return int(t.set_in_min[i])
+
+    @property
+    def set_in_diff(self) -> int:
+        return int(self.table.set_in_diff[self.index])
+
+    def __repr__(self) -> str:
+        # Same as `Event`, so that hashes of data are unchanged
+        return (
+            f"Event(name={self.name!r}, written_in={self.written_in!r},"
+            f" set_in={self.set_in!r})"
+        )
+
+
+class PublicationView:
+    """A publication in an `EventTable`, with the attributes of `Publication`"""
+
+    __slots__ = ("table", "index", "_series")
+
+    def __init__(self, table: EventTable, index: int) -> None:
+        self.table = table
+        self.index = index
+        self._series: list[EventView] | None = None
+
+    @property
+    def name(self) -> str:
+        return self.table.strings[self.table.publication_name[self.index]]
+
+    @property
+    def author(self) -> str | None:
+        return self.table.strings[self.table.publication_author[self.index]]
+
+    @property
+    def series(self) -> list[EventView]:
+        if self._series is None:
+            start, stop = self.table.starts[self.index : self.index + 2]
+            self._series = [EventView(self.table, i) for i in range(start, stop)]
+        return self._series
+
+    def __repr__(self) -> str:
+        # Same as `Publication`, so that hashes of data are unchanged
+        return (
+            f"Publication(name={self.name!r}, author={self.author!r},"
+            f" series={self.series!r})"
+        )
+
+
+def _year_columns(values: list[int | tuple[int, ...]]) -> tuple[np.ndarray, ...]:
+    """Columns of min, max, whether ranges, average and diff of years"""
+    bounds = np.array(
+        [(min(v), max(v)) if isinstance(v, tuple) else (v, v) for v in values],
+        dtype=np.int64,
+    ).reshape(-1, 2)
+    return (
+        bounds[:, 0],
+        bounds[:, 1],
+        np.array([isinstance(v, tuple) for v in values], dtype=bool),
+        np.array([average(v) for v in values], dtype=float),
+        np.array([diff(v) for v in values], dtype=np.int64),
+    )
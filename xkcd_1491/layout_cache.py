@@ -0,0 +1,122 @@
+"""Persistent cache of adjusted texts' positions
+
+Adjusting texts is deterministic for the same data, figure and fonts, so its
+result can be saved to disk and reused by later runs.
+
+Each layout is a JSON file named by its key, and the least recently used ones
+are removed when there are too many.
+
+When the key changes, texts can still start from the most recent layout of the
+same scope (e.g. the same figure and options), as long as their labels (hashes
+of their publications and initial states) match.
+"""
+
+from __future__ import annotations
+
+import json
+from hashlib import sha256
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from matplotlib.text import Annotation
+
+# Bump when adjusting gives other layouts for the same inputs, so that cached
+# layouts are not reused
+LAYOUT_VERSION = 2
+
+
+def layout_key(*parts) -> str:
+    """Hash everything that affects the layout
+
+    Parts are hashed by their `repr`, so they should have deterministic ones,
+    e.g. dataclasses, lists, dicts and numbers.
+    """
+    return sha256(repr(parts).encode("utf-8")).hexdigest()
+
+
+def load_layout(texts: list[Annotation], key: str, directory: Path) -> bool:
+    """Apply a cached layout to texts
+
+    Returns whether the layout was found and applied.
+    """
+    file = directory / f"{key}.json"
+    if not file.exists():
+        return False
+
+    layout = json.loads(file.read_text(encoding="utf-8"))
+    if not isinstance(layout, dict):
+        return False  # Saved before scopes
+    layout = layout["texts"]
+    if [t["text"] for t in layout] != [t.get_text() for t in texts]:
+        return False
+
+    for text, t in zip(texts, layout):
+        text.xyann = tuple(t["xyann"])
+        text.set_ha(t["ha"])
+        text.set_va(t["va"])
+        text.set_visible(t.get("visible", True))
+
+    file.touch()  # Mark as recently used
+    return True
+
+
+def load_warm_start(
+    labels: list[str], directory: Path, scope: str | None = None
+) -> list[tuple[tuple[float, float], str, str] | None] | None:
+    """Look up labels in the most recent layout saved with the same `scope`
+
+    Returns `warm_start` for `adjust_text`, or None if there is no such layout.
+    """
+    files = sorted(directory.glob("*.json"), key=lambda f: f.stat().st_mtime)
+    for file in reversed(files):
+        layout = json.loads(file.read_text(encoding="utf-8"))
+        if isinstance(layout, dict) and layout.get("scope") == scope:
+            break
+    else:
+        return None
+
+    previous = {
+        t["label"]: (tuple(t["xyann"]), t["ha"], t["va"])
+        for t in layout["texts"]
+        if "label" in t
+    }
+    return [previous.get(label) for label in labels]
+
+
+def save_layout(
+    texts: list[Annotation],
+    key: str,
+    directory: Path,
+    labels: list[str] | None = None,
+    scope: str | None = None,
+    max_entries: int = 16,
+) -> None:
+    """Save the layout of texts, and evict least recently used layouts
+
+    `labels` identify texts across layouts, and `scope` tells which layouts may
+    seed each other, see `load_warm_start`.
+    """
+    directory.mkdir(parents=True, exist_ok=True)
+    layout = [
+        {
+            "text": t.get_text(),
+            "xyann": [float(v) for v in t.xyann],
+            "ha": t.get_ha(),
+            "va": t.get_va(),
+            "visible": t.get_visible(),
+        }
+        for t in texts
+    ]
+    if labels is not None:
+        for t, label in zip(layout, labels):
+            t["label"] = label
+    (directory / f"{key}.json").write_text(
+        json.dumps({"scope": scope, "texts": layout}, ensure_ascii=False),
+        encoding="utf-8",
+    )
+
+    files = sorted(directory.glob("*.json"), key=lambda f: f.stat().st_mtime)
+    for file in files[:-max_entries]:
+        file.unlink()
@@ -0,0 +1,187 @@
+"""Occupancy grid of the axes
+
+Boxes are too coarse to avoid diagonal lines or skewed ellipses. Instead, shapes
+are rasterized once into a boolean grid over the axes, in display coordinates,
+and the occupied area inside any box is looked up in a summed-area table.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import numpy as np
+from matplotlib.lines import Line2D
+from matplotlib.patches import Patch
+
+if TYPE_CHECKING:
+    from typing import Iterable
+
+    from matplotlib.artist import Artist
+    from matplotlib.axes import Axes
+    from matplotlib.backend_bases import RendererBase
+    from matplotlib.path import Path
+
+
+class OccupancyGrid:
+    """Boolean grid of occupied cells, with a summed-area table
+
+    Cells are squares of `cell` display units, starting from the lower left
+    corner of `extent`, i.e. (xmin, ymin, xmax, ymax).
+    """
+
+    def __init__(self, extent, cell: float = 4) -> None:
+        self.extent = np.asarray(extent, dtype=float)
+        self.cell = cell
+        width, height = self.extent[2:] - self.extent[:2]
+        self.grid = np.zeros(
+            (max(1, int(np.ceil(height / cell))), max(1, int(np.ceil(width / cell)))),
+            dtype=bool,
+        )
+        self._table = None
+
+    @classmethod
+    def from_artists(
+        cls, artists: Iterable[Artist], ax: Axes, renderer: RendererBase, cell=4
+    ) -> OccupancyGrid:
+        """Rasterize lines, markers and patches over the axes
+
+        Lines are traced with their widths, markers are disks of their sizes, and
+        patches are filled. Other artists are ignored.
+        """
+        grid = cls(ax.patch.get_extents().extents, cell)
+        for artist in artists:
+            if isinstance(artist, Line2D):
+                path = artist.get_transform().transform_path(artist.get_path())
+                width = renderer.points_to_pixels(artist.get_linewidth())
+                if len(path.vertices) > 1 and artist.get_linestyle() != "None":
+                    grid.add_polyline(path.vertices, width)
+                if artist.get_marker() not in ("None", "", None):
+                    size = renderer.points_to_pixels(artist.get_markersize())
+                    grid.add_disks(path.vertices, size / 2)
+            elif isinstance(artist, Patch):
+                grid.add_polygon(
+                    artist.get_transform().transform_path(artist.get_path())
+                )
+        return grid
+
+    def _centers(self):
+        """x and y of the centers of columns and rows"""
+        ny, nx = self.grid.shape
+        x0, y0 = self.extent[:2]
+        return (
+            x0 + (np.arange(nx) + 0.5) * self.cell,
+            y0 + (np.arange(ny) + 0.5) * self.cell,
+        )
+
+    def _mark(self, x, y):
+        """Mark cells containing points"""
+        ny, nx = self.grid.shape
+        i = np.floor((y - self.extent[1]) / self.cell).astype(int)
+        j = np.floor((x - self.extent[0]) / self.cell).astype(int)
+        inside = (i >= 0) & (i < ny) & (j >= 0) & (j < nx)
+        self.grid[i[inside], j[inside]] = True
+        self._table = None
+
+    def add_polyline(self, vertices, width=0.0):
+        """Mark cells along a polyline of (N, 2) vertices, with a line width"""
+        vertices = vertices[np.isfinite(vertices).all(axis=1)]
+        if len(vertices) < 2:
+            return
+        starts, ends = vertices[:-1], vertices[1:]
+        # Sample every segment at least twice per cell
+        lengths = np.hypot(*(ends - starts).T)
+        # (Segments far beyond the grid are sampled more coarsely)
+        steps = np.ceil(np.minimum(lengths / self.cell, 2 * sum(self.grid.shape)) * 2)
+        steps = steps.astype(int) + 1
+        segment = np.repeat(np.arange(len(starts)), steps)
+        t = (np.arange(len(segment)) - np.repeat(np.cumsum(steps) - steps, steps)) / (
+            np.repeat(np.maximum(steps - 1, 1), steps)
+        )
+        points = starts[segment] + t[:, np.newaxis] * (ends - starts)[segment]
+
+        # Thicken the line by sampling across it as well
+        radius = width / 2
+        offsets = np.arange(-radius, radius + self.cell / 2, self.cell / 2)
+        for dx in offsets:
+            for dy in offsets:
+                if dx**2 + dy**2 <= radius**2 + 1e-9:
+                    self._mark(points[:, 0] + dx, points[:, 1] + dy)
+
+    def add_disks(self, centers, radius):
+        """Mark cells inside disks"""
+        for x, y in centers:
+            self._fill(
+                (x - radius, y - radius, x + radius, y + radius),
+                lambda cx, cy: (cx - x) ** 2 + (cy - y) ** 2 <= radius**2,
+            )
+            self._mark(np.array([x]), np.array([y]))
+
+    def add_polygon(self, path: Path):
+        """Mark cells whose centers are inside a closed path"""
+        vertices = path.vertices[np.isfinite(path.vertices).all(axis=1)]
+        if not len(vertices):
+            return
+        x0, y0 = vertices.min(axis=0)
+        x1, y1 = vertices.max(axis=0)
+        self._fill(
+            (x0, y0, x1, y1),
+            lambda cx, cy: path.contains_points(np.column_stack([cx, cy])),
+        )
+        # Keep the outline, in case the shape is thinner than a cell
+        self.add_polyline(vertices)
+
+    def _fill(self, extent, contains):
+        """Mark cells in `extent` whose centers satisfy `contains(cx, cy)`"""
+        xs, ys = self._centers()
+        columns = np.flatnonzero((xs >= extent[0]) & (xs <= extent[2]))
+        rows = np.flatnonzero((ys >= extent[1]) & (ys <= extent[3]))
+        if not (len(columns) and len(rows)):
+            return
+        cx, cy = np.meshgrid(xs[columns], ys[rows])
+        inside = np.asarray(contains(cx.ravel(), cy.ravel())).reshape(cx.shape)
+        self.grid[np.ix_(rows, columns)] |= inside
+        self._table = None
+
+    def get_areas(self, extents):
+        """Return the occupied areas inside (N, 4) extents, in display units²
+
+        Each box is looked up in the summed-area table in constant time. Boxes
+        are snapped outwards to cells.
+        """
+        if self._table is None:
+            self._table = np.zeros(np.add(self.grid.shape, 1), dtype=np.int64)
+            self._table[1:, 1:] = self.grid.cumsum(axis=0).cumsum(axis=1)
+        extents = np.asarray(extents, dtype=float).reshape(-1, 4)
+        ny, nx = self.grid.shape
+        x0, y0, x1, y1 = ((extents - np.tile(self.extent[:2], 2)) / self.cell).T
+        j0 = np.clip(np.floor(x0), 0, nx).astype(int)
+        j1 = np.clip(np.ceil(x1), 0, nx).astype(int)
+        i0 = np.clip(np.floor(y0), 0, ny).astype(int)
+        i1 = np.clip(np.ceil(y1), 0, ny).astype(int)
+        t = self._table
+        counts = t[i1, j1] - t[i0, j1] - t[i1, j0] + t[i0, j0]
+        return counts * self.cell**2
+
+    def get_repulsion(self, extents):
+        """Return (delta_x, delta_y) moving (N, 4) extents off occupied cells
+
+        A box is pushed away from the more occupied half along each axis, by the
+        difference of occupied areas divided by its other side, i.e. roughly by
+        how far the occupied cells reach into it.
+        """
+        x0, y0, x1, y1 = np.asarray(extents, dtype=float).T
+        xm = (x0 + x1) / 2
+        ym = (y0 + y1) / 2
+        left, right, bottom, top = (
+            self.get_areas(np.column_stack(e))
+            for e in [
+                (x0, y0, xm, y1),
+                (xm, y0, x1, y1),
+                (x0, y0, x1, ym),
+                (x0, ym, x1, y1),
+            ]
+        )
+        return (
+            (left - right) / np.maximum(y1 - y0, 1),
+            (bottom - top) / np.maximum(x1 - x0, 1),
+        )
@@ -0,0 +1,230 @@
+"""Candidate-position label placement
+
+Alternative engines for `adjust_text`, besides its force-directed repulsion.
+
+Every text gets 8 candidate positions around its anchor. Overlapping candidates
+of different texts form a conflict graph, and one candidate is selected per text,
+either greedily or by simulated annealing.
+
+An engine is called as
+`engine(extents, anchors, *, points, add_extents, ax_extent, expand)`,
+where all coordinates are display coordinates:
+    - `extents`: (N, 4) extents of texts.
+    - `anchors`: (N, 2) points annotated by texts.
+    - `points`: (P, 2) points to avoid.
+    - `add_extents`: (M, 4) extents of other objects to avoid.
+    - `ax_extent`: (xmin, ymin, xmax, ymax) of the axes.
+    - `expand`: how much to expand texts' bboxes when testing conflicts.
+    - `occupancy` (only passed if given): an `occupancy.OccupancyGrid` of
+      shapes to avoid.
+It returns the (N, 4) new extents of texts.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+
+from .adjust_text import expand_extents, get_candidate_pairs, iter_chunks
+
+# Directions of candidates from their anchors, in order of preference:
+# NE, E, N, NW, SE, W, S, SW
+SLOTS = np.array([(1, 1), (1, 0), (0, 1), (-1, 1), (1, -1), (-1, 0), (0, -1), (-1, -1)])
+
+
+def get_candidates(extents, anchors, gap=0.25):
+    """Return (N, 8, 4) candidate extents of texts around their anchors
+
+    `gap` is the distance between a candidate and its anchor, in text heights.
+    """
+    width = (extents[:, 2] - extents[:, 0])[:, np.newaxis]
+    height = (extents[:, 3] - extents[:, 1])[:, np.newaxis]
+    dx, dy = SLOTS.T
+    x0 = anchors[:, [0]] + dx * gap * height - width * (1 - dx) / 2
+    y0 = anchors[:, [1]] + dy * gap * height - height * (1 - dy) / 2
+    return np.stack([x0, y0, x0 + width, y0 + height], axis=-1)
+
+
+def get_penalties(candidates, points, add_extents, ax_extent, occupancy=None):
+    """Return (N, 8) penalties of candidates
+
+    A candidate is penalized by 10 for leaving the axes, and by 1 for every point
+    inside it or object overlapping it. If an `occupancy` grid is given, it is
+    also penalized by the fraction of its area occupied.
+    """
+    flat = candidates.reshape(-1, 4)
+    x0, y0, x1, y1 = flat.T
+    penalties = 10 * (
+        (x0 < ax_extent[0])
+        | (y0 < ax_extent[1])
+        | (x1 > ax_extent[2])
+        | (y1 > ax_extent[3])
+    ).astype(float)
+
+    for chunk in iter_chunks(len(flat), len(points)):
+        x0, y0, x1, y1 = (e[:, np.newaxis] for e in flat[chunk].T)
+        px, py = points.T
+        penalties[chunk] += np.sum((px > x0) & (px < x1) & (py > y0) & (py < y1), 1)
+    for chunk in iter_chunks(len(flat), len(add_extents)):
+        x0, y0, x1, y1 = (e[:, np.newaxis] for e in flat[chunk].T)
+        bx0, by0, bx1, by1 = add_extents.T
+        penalties[chunk] += np.sum(
+            (np.minimum(x1, bx1) > np.maximum(x0, bx0))
+            & (np.minimum(y1, by1) > np.maximum(y0, by0)),
+            1,
+        )
+
+    if occupancy is not None:
+        x0, y0, x1, y1 = flat.T
+        penalties += occupancy.get_areas(flat) / np.maximum((x1 - x0) * (y1 - y0), 1)
+
+    return penalties.reshape(candidates.shape[:2])
+
+
+def get_conflicts(candidates, expand=(1, 1)):
+    """Return the conflict graph of candidates
+
+    Candidates are numbered as `candidates.reshape(-1, 4)`.
+
+    Returns
+    -------
+    indptr : (8N + 1,) array
+        Conflicts of candidate c are `neighbors[indptr[c]:indptr[c + 1]]`.
+    neighbors : array
+        Candidates of other texts overlapping.
+    areas : array
+        Overlapping areas, aligned with `neighbors`.
+    """
+    flat = expand_extents(candidates.reshape(-1, 4), expand)
+    n_slots = candidates.shape[1]
+    i, j = get_candidate_pairs(flat)
+
+    x0, y0, x1, y1 = flat.T
+    overlaps_x = np.minimum(x1[i], x1[j]) - np.maximum(x0[i], x0[j])
+    overlaps_y = np.minimum(y1[i], y1[j]) - np.maximum(y0[i], y0[j])
+    conflict = (i // n_slots != j // n_slots) & (overlaps_x > 0) & (overlaps_y > 0)
+    i, j = i[conflict], j[conflict]
+
+    indptr = np.searchsorted(i, np.arange(len(flat) + 1))
+    return indptr, j, overlaps_x[conflict] * overlaps_y[conflict]
+
+
+def place_greedy(
+    extents,
+    anchors,
+    *,
+    points,
+    add_extents,
+    ax_extent,
+    expand=(1, 1),
+    occupancy=None,
+):
+    """Select candidates greedily, like a maximal independent set
+
+    Candidates are visited by penalty, then by number of conflicts, then by
+    preference. A candidate is taken if its text has not been placed and no taken
+    candidate conflicts with it. Texts left over take the candidate conflicting
+    with the fewest taken ones.
+    """
+    candidates = get_candidates(extents, anchors)
+    n, n_slots = candidates.shape[:2]
+    penalties = get_penalties(
+        candidates, points, add_extents, ax_extent, occupancy
+    ).ravel()
+    indptr, neighbors, _ = get_conflicts(candidates, expand)
+    degrees = np.diff(indptr)
+    preferences = np.arange(n * n_slots) % n_slots
+
+    chosen = np.full(n, -1)
+    blocked = np.zeros(n * n_slots, dtype=bool)
+    for c in np.lexsort((preferences, degrees, penalties)):
+        if chosen[c // n_slots] >= 0 or blocked[c]:
+            continue
+        chosen[c // n_slots] = c
+        blocked[neighbors[indptr[c] : indptr[c + 1]]] = True
+
+    taken = np.zeros(n * n_slots, dtype=bool)
+    taken[chosen[chosen >= 0]] = True
+    for text in np.flatnonzero(chosen < 0):
+        options = np.arange(text * n_slots, (text + 1) * n_slots)
+        n_conflicts = [
+            np.sum(taken[neighbors[indptr[c] : indptr[c + 1]]]) for c in options
+        ]
+        c = options[np.lexsort((penalties[options], n_conflicts))[0]]
+        chosen[text] = c
+        taken[c] = True
+
+    return candidates.reshape(-1, 4)[chosen]
+
+
+def place_annealing(
+    extents,
+    anchors,
+    *,
+    points,
+    add_extents,
+    ax_extent,
+    expand=(1, 1),
+    occupancy=None,
+    n_moves=None,
+    seed=0,
+):
+    """Select candidates by simulated annealing
+
+    The energy is the total overlapping area of selected candidates, plus
+    penalties in units of the median text area. Each move switches a random text
+    to another random candidate, and the temperature cools geometrically.
+
+    Parameters
+    ----------
+    n_moves : int, optional
+        Number of moves. The default is 30 per text.
+    seed : optional
+        Seed of the random generator.
+    """
+    candidates = get_candidates(extents, anchors)
+    n, n_slots = candidates.shape[:2]
+    if n == 0:
+        return extents
+    area = np.median((extents[:, 2] - extents[:, 0]) * (extents[:, 3] - extents[:, 1]))
+    preferences = np.arange(n * n_slots) % n_slots
+    costs = area * (
+        get_penalties(candidates, points, add_extents, ax_extent, occupancy).ravel()
+        + preferences / (10 * n_slots)
+    )
+    indptr, neighbors, areas = get_conflicts(candidates, expand)
+
+    chosen = np.argmin(costs.reshape(n, n_slots), axis=1) + np.arange(n) * n_slots
+    taken = np.zeros(n * n_slots, dtype=bool)
+    taken[chosen] = True
+
+    def energy(c):
+        """Energy contributed by candidate c"""
+        conflicts = slice(indptr[c], indptr[c + 1])
+        return costs[c] + np.sum(areas[conflicts][taken[neighbors[conflicts]]])
+
+    n_moves = 30 * n if n_moves is None else n_moves
+    rng = np.random.default_rng(seed)
+    texts = rng.integers(n, size=n_moves)
+    shifts = rng.integers(1, n_slots, size=n_moves)
+    thresholds = rng.random(n_moves)
+    # Cool from the median text area to a thousandth of it
+    temperatures = area * np.geomspace(1, 1e-3, num=n_moves)
+
+    for text, shift, threshold, temperature in zip(
+        texts, shifts, thresholds, temperatures
+    ):
+        old = chosen[text]
+        new = text * n_slots + (old + shift) % n_slots
+        taken[old] = False
+        delta = energy(new) - energy(old)
+        if delta <= 0 or threshold < np.exp(-delta / temperature):
+            chosen[text] = new
+        taken[chosen[text]] = True
+
+    return candidates.reshape(-1, 4)[chosen]
+
+
+engines = {
+    "greedy": place_greedy,
+    "anneal": place_annealing,
+}
@@ -0,0 +1,20 @@
+"""Process pools
+
+Data are loaded with Polars, and forking a process that has used Polars' thread
+pool may deadlock, so workers are spawned rather than forked.
+
+Spawned workers import the parent's main module again. Scripts starting a pool
+must therefore put their work under `if __name__ == "__main__"`. Running
+`python -m xkcd_1491` needs no guard, because `multiprocessing` does not import
+modules named `__main__` again.
+"""
+
+from __future__ import annotations
+
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+
+
+def process_pool(n_jobs: int | None = None) -> ProcessPoolExecutor:
+    """A pool of `n_jobs` spawned processes, by default one per CPU"""
+    return ProcessPoolExecutor(max_workers=n_jobs, mp_context=get_context("spawn"))
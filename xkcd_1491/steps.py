@@ -0,0 +1,139 @@
+"""Record steps of adjusting texts, and render them afterwards
+
+Saving a figure takes much longer than an iteration of adjusting, so steps are
+recorded as positions in memory, and rendered after adjusting, either as image
+files (optionally in a process pool) or as an animation.
+"""
+
+from __future__ import annotations
+
+import pickle
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+import numpy as np
+from matplotlib.animation import FuncAnimation
+
+from .pool import process_pool
+
+if TYPE_CHECKING:
+    from matplotlib.figure import Figure
+    from matplotlib.text import Annotation
+
+# Formats saved as a single animation, and their writers
+animation_writers = {"gif": "pillow", "mp4": "ffmpeg"}
+
+
+@dataclass
+class Step:
+    """A recorded step"""
+
+    name: str
+    """Suffix of the file name"""
+    title: str | int | None
+    """Title of the axes, or None to keep it"""
+    positions: np.ndarray
+    """(N, 2) positions of texts, in their own coordinates"""
+    ha: list[str]
+    va: list[str]
+
+
+def record_step(texts: list[Annotation], name: str, title: str | int | None) -> Step:
+    """Record the current positions and alignments of texts"""
+    return Step(
+        name=name,
+        title=title,
+        positions=np.array([t.get_position() for t in texts]),
+        ha=[t.get_ha() for t in texts],
+        va=[t.get_va() for t in texts],
+    )
+
+
+def apply_step(texts: list[Annotation], step: Step) -> None:
+    """Move texts as recorded in a step"""
+    for text, position, ha, va in zip(texts, step.positions, step.ha, step.va):
+        text.set_position(position)
+        text.set_ha(ha)
+        text.set_va(va)
+    if step.title is not None:
+        texts[0].axes.set_title(step.title)
+
+
+def _render_files(
+    fig: Figure | bytes,
+    texts: list[Annotation] | list[tuple[int, int]],
+    steps: list[Step],
+    save_prefix: str,
+    save_format: str,
+    dpi: float,
+) -> None:
+    """Save steps as image files
+
+    In a worker process, `fig` is pickled, and `texts` are located by indices of
+    their axes in the figure and of themselves in the axes.
+    """
+    if isinstance(fig, bytes):
+        fig = pickle.loads(fig)
+        texts = [fig.axes[a].texts[t] for a, t in texts]
+    for step in steps:
+        apply_step(texts, step)
+        fig.savefig(
+            f"{save_prefix}{step.name}.{save_format}", format=save_format, dpi=dpi
+        )
+
+
+def render_steps(
+    steps: list[Step],
+    texts: list[Annotation],
+    *,
+    save_prefix="",
+    save_format="png",
+    dpi=150,
+    n_jobs: int | None = None,
+) -> None:
+    """Render recorded steps
+
+    Each step is saved as `{save_prefix}{step.name}.{save_format}`, unless
+    `save_format` is in `animation_writers`, in which case all steps are saved
+    as one animation `{save_prefix}steps.{save_format}`.
+
+    Image files are rendered in `n_jobs` processes if it is more than 1, see
+    `pool`.
+    Texts are restored afterwards.
+    """
+    if not steps:
+        return
+    fig = texts[0].get_figure()
+    current = record_step(texts, "", texts[0].axes.get_title())
+
+    if save_format in animation_writers:
+        animation = FuncAnimation(
+            fig, lambda step: apply_step(texts, step), frames=steps, repeat=False
+        )
+        animation.save(
+            f"{save_prefix}steps.{save_format}",
+            writer=animation_writers[save_format],
+            dpi=dpi,
+        )
+    elif n_jobs is None or n_jobs <= 1:
+        _render_files(fig, texts, steps, save_prefix, save_format, dpi)
+    else:
+        fig_pickle = pickle.dumps(fig)
+        locations = [(fig.axes.index(t.axes), t.axes.texts.index(t)) for t in texts]
+        with process_pool(n_jobs) as pool:
+            futures = [
+                pool.submit(
+                    _render_files,
+                    fig_pickle,
+                    locations,
+                    steps[i::n_jobs],
+                    save_prefix,
+                    save_format,
+                    dpi,
+                )
+                for i in range(n_jobs)
+            ]
+            for f in futures:
+                f.result()
+
+    apply_step(texts, current)
@@ -16,6 +16,7 @@ if TYPE_CHECKING:
     from matplotlib.text import Annotation
 
     from .data import Event, Publication
+    from .data.table import EventView, PublicationView
 
 palette = cycle(
     [
@@ -33,7 +34,9 @@ palette = cycle(
 )
 
 
-def draw(publication: Publication, ax: Axes, *, color: Color) -> list[Annotation]:
+def draw(
+    publication: Publication | PublicationView, ax: Axes, *, color: Color
+) -> list[Annotation]:
     """Plot and annotate a publication"""
 
     if len(publication.series) == 1:
@@ -58,14 +61,14 @@ def draw(publication: Publication, ax: Axes, *, color: Color) -> list[Annotation
         return _draw_series(publication, ax, color=color)
 
 
-def event_to_xy(event: Event) -> tuple[float | int, float | int]:
+def event_to_xy(event: Event | EventView) -> tuple[float | int, float | int]:
     return (
         event.written_in_average,
         event.set_in_average - event.written_in_average,
     )
 
 
-def draw_event_diff(event: Event, ax: Axes, **kwargs) -> None:
+def draw_event_diff(event: Event | EventView, ax: Axes, **kwargs) -> None:
     """Draw an ellipse to represent uncertainty of an event
 
     Parameters:
@@ -88,7 +91,7 @@ def draw_event_diff(event: Event, ax: Axes, **kwargs) -> None:
 
 
 def _draw_event(
-    event: Event,
+    event: Event | EventView,
     ax: Axes,
     *,
     color: Color,
@@ -115,7 +118,7 @@ def _draw_event(
 
 
 def _draw_series(
-    publication: Publication, ax: Axes, *, color: Color
+    publication: Publication | PublicationView, ax: Axes, *, color: Color
 ) -> list[Annotation]:
     """Plot and annotate a series of events"""
 
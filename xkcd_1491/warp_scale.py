@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from functools import reduce
+from functools import partial, reduce
 from typing import TYPE_CHECKING
 
 from matplotlib.scale import FuncScale
@@ -20,6 +20,14 @@ def asinh_(x, linear_width: float):
     return linear_width * arcsinh(x / linear_width)
 
 
+def warp(x, center: float, linear_widths: Reversible[float]):
+    return reduce(asinh_, linear_widths, x - center)
+
+
+def unwarp(y, center: float, linear_widths: Reversible[float]):
+    return reduce(sinh_, reversed(linear_widths), y) + center
+
+
 class WarpScale(FuncScale):
     """Warp Scale
 
@@ -41,10 +49,8 @@ class WarpScale(FuncScale):
                 The scale parameters defining the extent of the quasi-linear region.
         """
 
-        def forward(x):
-            return reduce(asinh_, linear_widths, x - center)
-
-        def inverse(y):
-            return reduce(sinh_, reversed(linear_widths), y) + center
+        # Partial functions rather than closures, so that figures can be pickled
+        forward = partial(warp, center=center, linear_widths=linear_widths)
+        inverse = partial(unwarp, center=center, linear_widths=linear_widths)
 
         super().__init__(axis, functions=(forward, inverse))